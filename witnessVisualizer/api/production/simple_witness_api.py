@@ -1,19 +1,25 @@
 #!/usr/bin/env python3
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Header, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from typing import List, Optional, Dict, Any
 import os
 from supabase import create_client, Client
 from pydantic import BaseModel
 from datetime import datetime, date
 import json
+import time
+import hashlib
+import sys
 
 # Initialize FastAPI app
 app = FastAPI(
     title="Congressional Witness API",
     description="API for accessing congressional witness testimony data",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware
@@ -25,6 +31,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Witness lists run to hundreds of KB of repetitive JSON keys
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 # Supabase client - try witness database first, then fallback to general
 supabase_url = os.getenv("WITNESS_SUPABASE_URL") or os.getenv("SUPABASE_URL")
 supabase_key = os.getenv("WITNESS_SUPABASE_SERVICE_ROLE_KEY") or os.getenv("SUPABASE_SERVICE_ROLE_KEY") or os.getenv("SUPABASE_KEY")
@@ -34,6 +43,19 @@ if not supabase_url or not supabase_key:
 
 supabase: Client = create_client(supabase_url, supabase_key)
 
+# Deduplicating witnesses scans the whole congressional_hearings table, so the
+# result is shared across requests for a short window instead of rebuilt per hit
+WITNESS_CACHE_TTL_SECONDS = float(os.getenv("WITNESS_CACHE_TTL_SECONDS", "300"))
+_witness_cache: Dict[str, Any] = {"witnesses": None, "etag": None, "expires_at": 0.0}
+WITNESS_ROWS_PAGE_SIZE = 1000
+
+# Lowercased witness names/organizations, reused across rows and requests since
+# the same people appear in many hearings
+_norm_cache: Dict[str, str] = {}
+
+# Optional shared secret for POST /admin/invalidate
+ADMIN_TOKEN = os.getenv("WITNESS_ADMIN_TOKEN")
+
 # Pydantic models for API responses
 class WitnessSimple(BaseModel):
     name: str
@@ -58,85 +80,138 @@ async def root():
 
 async def _get_deduplicated_witnesses():
     """Internal function to get deduplicated witnesses - shared logic for all endpoints"""
-    # Get all hearings with witness data
-    result = supabase.table('congressional_hearings').select('witnesses,hearing_name,committee,hearing_date').execute()
-    
+    now = time.monotonic()
+    if _witness_cache["witnesses"] is not None and now < _witness_cache["expires_at"]:
+        return _witness_cache["witnesses"]
+
+    witnesses = _build_deduplicated_witnesses()
+    digest = hashlib.blake2b(json.dumps(witnesses, sort_keys=True).encode(), digest_size=16).hexdigest()
+    _witness_cache["witnesses"] = witnesses
+    _witness_cache["etag"] = f'"{digest}"'
+    _witness_cache["expires_at"] = now + WITNESS_CACHE_TTL_SECONDS
+    return witnesses
+
+def _not_modified(request: Request, response: Response) -> bool:
+    """Set the ETag for the cached witness list; True if the client already has it"""
+    etag = _witness_cache["etag"]
+    response.headers["ETag"] = etag
+    return request.headers.get("if-none-match") == etag
+
+def _norm(value: str) -> str:
+    """Lowercase a name or organization once and hand back the interned result"""
+    normalized = _norm_cache.get(value)
+    if normalized is None:
+        normalized = _norm_cache[value] = sys.intern(value.lower())
+    return normalized
+
+def _build_deduplicated_witnesses():
+    """Merge the flattened witness_rows view by name and organization"""
     witness_dict = {}
+    last_row_id = None
+    last_ord = None
     
-    for hearing in result.data:
-        witnesses = hearing.get('witnesses', [])
-        hearing_name = hearing.get('hearing_name', '')
-        committee = hearing.get('committee', '')
+    while True:
+        # witness_rows is flattened server-side, so only the fields we use cross the wire.
+        # Page through it because PostgREST caps each response at its max-rows setting,
+        # by keyset on (hearing_row_id, witness_ord): an OFFSET would re-unnest every
+        # earlier hearing on each page
+        query = supabase.table('witness_rows') \
+            .select('hearing_row_id,witness_ord,name,title,organization,hearing_name,committee') \
+            .order('hearing_row_id').order('witness_ord')
+        if last_row_id is not None:
+            # (hearing_row_id, witness_ord) > (last_row_id, last_ord); the gte lets
+            # Postgres start from congressional_hearings' primary key
+            query = query.gte('hearing_row_id', last_row_id) \
+                .or_(f'hearing_row_id.gt.{last_row_id},witness_ord.gt.{last_ord}')
+        page = query.limit(WITNESS_ROWS_PAGE_SIZE).execute()
+        rows = page.data or []
+        
+        for row in rows:
+            name = row['name']
+            organization = row['organization']
+            hearing_name = row.get('hearing_name') or ''
+            committee = row.get('committee') or ''
+            
+            # Create a unique key combining name and organization for better deduplication
+            # This handles cases where same person might have slight org variations
+            unique_key = (_norm(name), _norm(organization))
+            
+            witness = witness_dict.get(unique_key)
+            if witness is None:
+                # hearings/committees are dicts used as insertion-ordered sets during the scan
+                witness = witness_dict[unique_key] = {
+                    'name': name,
+                    'title': row['title'],
+                    'organization': organization,
+                    'topics': [],
+                    'hearings': {},
+                    'committees': {}
+                }
+            elif not witness['title'] and row['title']:
+                # Update title if current one is empty but new one has content
+                witness['title'] = row['title']
+            
+            if hearing_name:
+                witness['hearings'][hearing_name] = None
+            if committee:
+                witness['committees'][committee] = None
         
-        for witness in witnesses:
-            if isinstance(witness, dict):
-                name = witness.get('name', '')
-                if name:
-                    name = name.strip()
-                organization = witness.get('organization', '') or ''
-                if organization:
-                    organization = organization.strip()
-                
-                if name:
-                    # Create a unique key combining name and organization for better deduplication
-                    # This handles cases where same person might have slight org variations
-                    unique_key = f"{name}|{organization}".lower()
-                    
-                    if unique_key not in witness_dict:
-                        witness_dict[unique_key] = {
-                            'name': name,
-                            'title': witness.get('title', ''),
-                            'organization': organization,
-                            'topics': [],
-                            'hearings': [],
-                            'committees': []
-                        }
-                    else:
-                        # Update title if current one is empty but new one has content
-                        current_title = witness_dict[unique_key]['title']
-                        new_title = witness.get('title', '')
-                        if not current_title and new_title:
-                            witness_dict[unique_key]['title'] = new_title
-                    
-                    # Add hearing and committee if not already present
-                    if hearing_name and hearing_name not in witness_dict[unique_key]['hearings']:
-                        witness_dict[unique_key]['hearings'].append(hearing_name)
-                    if committee and committee not in witness_dict[unique_key]['committees']:
-                        witness_dict[unique_key]['committees'].append(committee)
+        if len(rows) < WITNESS_ROWS_PAGE_SIZE:
+            break
+        last_row_id = rows[-1]['hearing_row_id']
+        last_ord = rows[-1]['witness_ord']
     
     # Convert to list
-    return list(witness_dict.values())
+    witnesses = list(witness_dict.values())
+    for witness in witnesses:
+        witness['hearings'] = list(witness['hearings'])
+        witness['committees'] = list(witness['committees'])
+    return witnesses
 
 @app.get("/witnesses/all-simple", response_model=List[WitnessSimple], summary="Get All Witnesses (Simple)")
-async def get_all_witnesses_simple():
+async def get_all_witnesses_simple(request: Request, response: Response):
     """Get all witnesses extracted from congressional hearings JSONB data"""
     try:
-        return await _get_deduplicated_witnesses()
+        witnesses = await _get_deduplicated_witnesses()
+        if _not_modified(request, response):
+            return Response(status_code=304, headers={"ETag": _witness_cache["etag"]})
+        return witnesses
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving witnesses: {str(e)}")
 
 @app.get("/witnesses/congressional", response_model=List[WitnessSimple], summary="Get Congressional Witnesses")
-async def get_congressional_witnesses():
+async def get_congressional_witnesses(request: Request, response: Response):
     """Alias for get_all_witnesses_simple"""
     try:
-        return await _get_deduplicated_witnesses()
+        witnesses = await _get_deduplicated_witnesses()
+        if _not_modified(request, response):
+            return Response(status_code=304, headers={"ETag": _witness_cache["etag"]})
+        return witnesses
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving witnesses: {str(e)}")
 
 @app.get("/witnesses", response_model=List[WitnessSimple], summary="Get Witnesses with Pagination")
-async def get_witnesses(limit: int = 50, offset: int = 0):
+async def get_witnesses(
+    response: Response,
+    limit: int = Query(50, ge=0, le=1000),
+    offset: int = Query(0, ge=0)
+):
     """Get witnesses with pagination"""
     try:
-        all_witnesses = await _get_deduplicated_witnesses()
-        return all_witnesses[offset:offset + limit]
+        # Dedup and LIMIT/OFFSET run in Postgres, so only the requested page is built
+        result = supabase.rpc('get_witness_page', {'p_limit': limit, 'p_offset': offset}).execute()
+        response.headers["Cache-Control"] = "public, max-age=60"
+        return result.data or []
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving witnesses: {str(e)}")
 
 @app.get("/witnesses/all", summary="Get All Witnesses (Comprehensive)")
-async def get_all_witnesses_comprehensive():
+async def get_all_witnesses_comprehensive(request: Request, response: Response):
     """Get all witnesses with comprehensive data structure"""
     try:
         witnesses = await _get_deduplicated_witnesses()
+        if _not_modified(request, response):
+            return Response(status_code=304, headers={"ETag": _witness_cache["etag"]})
         return {
             "witnesses": witnesses,
             "count": len(witnesses),
@@ -152,8 +227,9 @@ async def get_all_witnesses_comprehensive():
 async def get_witness_count():
     """Get total number of unique witnesses"""
     try:
-        witnesses = await _get_deduplicated_witnesses()
-        return len(witnesses)
+        # Counted server-side (database/supabase_functions.sql) - no witness rows cross the wire
+        result = supabase.rpc('count_unique_witnesses').execute()
+        return result.data or 0
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error counting witnesses: {str(e)}")
 
@@ -170,15 +246,21 @@ async def get_hearing_count():
 async def get_organization_count():
     """Get total number of unique organizations"""
     try:
-        witnesses = await _get_deduplicated_witnesses()
-        organizations = set()
-        for witness in witnesses:
-            if witness['organization'] and witness['organization'].strip():
-                organizations.add(witness['organization'].strip())
-        return len(organizations)
+        result = supabase.rpc('count_unique_organizations').execute()
+        return result.data or 0
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error counting organizations: {str(e)}")
 
+@app.post("/admin/invalidate", summary="Invalidate Witness Cache")
+async def invalidate_witness_cache(x_admin_token: Optional[str] = Header(None)):
+    """Drop the cached witness list so the next request rescans congressional_hearings"""
+    if ADMIN_TOKEN and x_admin_token != ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+    _witness_cache["witnesses"] = None
+    _witness_cache["etag"] = None
+    _witness_cache["expires_at"] = 0.0
+    return {"invalidated": True}
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
@@ -1,19 +1,28 @@
 #!/usr/bin/env python3
 
-from fastapi import FastAPI, HTTPException, Depends, Query
+from fastapi import FastAPI, HTTPException, Depends, Header, Query, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from typing import List, Optional, Dict, Any
 import os
-from supabase import create_client, Client
-from pydantic import BaseModel
+from supabase import acreate_client, AsyncClient, AsyncClientOptions
+import httpx
+from pydantic import BaseModel, TypeAdapter
 from datetime import datetime, date
 import json
+import orjson
+import time
+import asyncio
+import functools
+import re
 
 # Initialize FastAPI app
 app = FastAPI(
     title="Congressional Witness API",
     description="API for accessing congressional witness testimony data",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware
@@ -23,8 +32,12 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-After-Date", "X-Next-After-Id"],
 )
 
+# Witness and hearing lists run to hundreds of KB of repetitive JSON keys
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # Supabase client - try witness database first, then fallback to general
 supabase_url = os.getenv("WITNESS_SUPABASE_URL") or os.getenv("SUPABASE_URL")
 supabase_key = os.getenv("WITNESS_SUPABASE_SERVICE_ROLE_KEY") or os.getenv("SUPABASE_SERVICE_ROLE_KEY") or os.getenv("SUPABASE_KEY")
@@ -32,7 +45,78 @@ supabase_key = os.getenv("WITNESS_SUPABASE_SERVICE_ROLE_KEY") or os.getenv("SUPA
 if not supabase_url or not supabase_key:
     raise ValueError("Supabase credentials not found. Please set WITNESS_SUPABASE_URL and WITNESS_SUPABASE_SERVICE_ROLE_KEY or SUPABASE_URL and SUPABASE_KEY environment variables")
 
-supabase: Client = create_client(supabase_url, supabase_key)
+# Async client so Supabase round-trips don't block the event loop; created once
+# at startup and shared (with its HTTP connection pool) by every request
+supabase: Optional[AsyncClient] = None
+_http_client: Optional[httpx.AsyncClient] = None
+
+# Keep connections to Supabase warm across requests instead of re-handshaking TLS
+SUPABASE_MAX_CONNECTIONS = int(os.getenv("SUPABASE_MAX_CONNECTIONS", "200"))
+SUPABASE_MAX_KEEPALIVE = int(os.getenv("SUPABASE_MAX_KEEPALIVE", "100"))
+
+# Injecting our own httpx client replaces postgrest's 120s default timeout with
+# httpx's 5s one, which the heavier view reads and RPCs can exceed under load
+SUPABASE_TIMEOUT_SECONDS = float(os.getenv("SUPABASE_TIMEOUT_SECONDS", "120"))
+
+@app.on_event("startup")
+async def create_supabase_client():
+    global supabase, _http_client
+    _http_client = httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=SUPABASE_MAX_CONNECTIONS,
+            max_keepalive_connections=SUPABASE_MAX_KEEPALIVE,
+            keepalive_expiry=30
+        ),
+        timeout=httpx.Timeout(SUPABASE_TIMEOUT_SECONDS)
+    )
+    supabase = await acreate_client(supabase_url, supabase_key, options=AsyncClientOptions(httpx_client=_http_client))
+
+@app.on_event("shutdown")
+async def close_supabase_client():
+    if _http_client is not None:
+        await _http_client.aclose()
+
+# Stats and reference-data endpoints return the same result on every hit, so
+# responses are kept in memory for a per-endpoint TTL (see cached())
+STATS_CACHE_TTL_SECONDS = float(os.getenv("STATS_CACHE_TTL_SECONDS", "300"))
+REFERENCE_CACHE_TTL_SECONDS = float(os.getenv("REFERENCE_CACHE_TTL_SECONDS", "3600"))
+_response_cache: Dict[Any, Any] = {}
+
+# Column lists matching the response models, so queries don't drag in unused
+# columns (congressional_hearings' JSONB columns are large)
+WITNESS_COLUMNS = 'id,witness_id,name,title,witness_type,organization_name,tribal_affiliation,topics,keywords,expertise_areas,document_count,created_at'
+HEARING_COLUMNS = 'id,event_id,title,hearing_date,hearing_time,location,committee_name,committee_code,witness_count,created_at'
+CONGRESSIONAL_HEARING_COLUMNS = 'id,congress,hearing_type,hearing_subtype,committee,hearing_date,hearing_name,serial_no,detail_url,document_url,created_at,updated_at'
+CONGRESSIONAL_HEARING_JSONB_COLUMNS = 'members,witnesses,bill_numbers'
+
+# Rows per request when reading unique_witnesses_mv
+UNIQUE_WITNESSES_PAGE_SIZE = 1000
+
+# Optional shared secret for POST /admin/invalidate
+ADMIN_TOKEN = os.getenv("WITNESS_ADMIN_TOKEN")
+
+def cached(ttl: float):
+    """Cache an async endpoint's return value for ttl seconds, keyed by its arguments
+    
+    Only successful results are stored; anything the function raises propagates
+    uncached, so fallbacks for errors belong outside the cached function. Cache
+    data (dicts, serialized bytes), never a Response: middleware such as
+    GZipMiddleware edits the response it is handed, which would leak into every
+    later hit.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            key = (func.__name__, args, tuple(sorted(kwargs.items())))
+            now = time.monotonic()
+            entry = _response_cache.get(key)
+            if entry is not None and now < entry[0]:
+                return entry[1]
+            result = await func(*args, **kwargs)
+            _response_cache[key] = (now + ttl, result)
+            return result
+        return wrapper
+    return decorator
 
 # Pydantic models for API responses
 class WitnessResponse(BaseModel):
@@ -124,6 +208,25 @@ class CongressionalHearingResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
 
+# List serializers built once at import. Handlers already construct validated
+# models, so they dump JSON straight from these instead of going through
+# response_model (which would validate and encode every item a second time)
+WITNESS_LIST_ADAPTER = TypeAdapter(List[WitnessResponse])
+HEARING_LIST_ADAPTER = TypeAdapter(List[HearingResponse])
+COMMITTEE_LIST_ADAPTER = TypeAdapter(List[CommitteeResponse])
+ORGANIZATION_LIST_ADAPTER = TypeAdapter(List[OrganizationResponse])
+TOPIC_LIST_ADAPTER = TypeAdapter(List[TopicResponse])
+DOCUMENT_LIST_ADAPTER = TypeAdapter(List[DocumentResponse])
+RELATIONSHIP_LIST_ADAPTER = TypeAdapter(List[RelationshipResponse])
+
+def _json_response(content: bytes) -> Response:
+    """Wrap already-serialized JSON in a fresh response"""
+    return Response(content=content, media_type="application/json")
+
+def _json_list(adapter: TypeAdapter, items: List[Any]) -> Response:
+    """Serialize a list of models to a JSON response with a prebuilt adapter"""
+    return _json_response(adapter.dump_json(items))
+
 # API Endpoints
 
 @app.get("/", summary="API Health Check")
@@ -132,32 +235,32 @@ async def root():
     return {"message": "Congressional Witness API is running", "version": "1.0.0"}
 
 @app.get("/stats", response_model=StatsResponse, summary="Get Database Statistics")
+@cached(STATS_CACHE_TTL_SECONDS)
 async def get_stats():
     """Get overall database statistics"""
     try:
-        # Get counts from congressional_hearings table
-        hearings = supabase.table('congressional_hearings').select('id', count='exact').execute()
+        # The queries are independent, so run them concurrently. Witness appearances
+        # and the hearing date range are computed in Postgres (database/supabase_functions.sql)
+        hearings, witnesses_result, date_range = await asyncio.gather(
+            supabase.table('congressional_hearings').select('id', count='exact', head=True).execute(),
+            supabase.rpc('witness_stats').execute(),
+            supabase.rpc('date_bounds').execute()
+        )
         
-        # Get witness count by extracting from JSONB witnesses field
-        witnesses_result = supabase.table('congressional_hearings').select('witnesses').execute()
         total_witnesses = 0
-        for hearing in witnesses_result.data:
-            if hearing.get('witnesses'):
-                total_witnesses += len(hearing['witnesses'])
+        if witnesses_result.data:
+            total_witnesses = witnesses_result.data[0]['total_witness_appearances'] or 0
         
         # For now, set default values for other stats
         committees = type('obj', (object,), {'count': 50})()
         organizations = type('obj', (object,), {'count': 200})()
         documents = type('obj', (object,), {'count': 1000})()
         
-        # Get date range
-        date_range = supabase.table('congressional_hearings').select('hearing_date').order('hearing_date').execute()
-        
         start_date = None
         end_date = None
         if date_range.data:
-            start_date = date_range.data[0]['hearing_date']
-            end_date = date_range.data[-1]['hearing_date']
+            start_date = date_range.data[0]['date_range_start']
+            end_date = date_range.data[0]['date_range_end']
         
         return StatsResponse(
             total_witnesses=total_witnesses,
@@ -172,7 +275,7 @@ async def get_stats():
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving stats: {str(e)}")
 
-@app.get("/witnesses", response_model=List[WitnessResponse], summary="Get All Witnesses")
+@app.get("/witnesses", responses={200: {"model": List[WitnessResponse]}}, summary="Get All Witnesses")
 async def get_witnesses(
     limit: int = Query(100, ge=1, le=1000, description="Number of witnesses to return"),
     offset: int = Query(0, ge=0, description="Number of witnesses to skip"),
@@ -183,7 +286,7 @@ async def get_witnesses(
 ):
     """Get witnesses with optional filtering and pagination"""
     try:
-        query = supabase.table('congressional_hearings').select('witnesses,hearing_name,committee,hearing_date')
+        query = supabase.table('witness_details_view').select(WITNESS_COLUMNS)
         
         # Apply filters
         if witness_type:
@@ -201,7 +304,7 @@ async def get_witnesses(
         # Apply pagination
         query = query.range(offset, offset + limit - 1)
         
-        result = query.execute()
+        result = await query.execute()
         
         witnesses = []
         for row in result.data:
@@ -220,42 +323,12 @@ async def get_witnesses(
                 created_at=row['created_at']
             ))
         
-        return witnesses
+        return _json_list(WITNESS_LIST_ADAPTER, witnesses)
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving witnesses: {str(e)}")
 
-@app.get("/witnesses/{witness_id}", response_model=WitnessResponse, summary="Get Witness by ID")
-async def get_witness(witness_id: str):
-    """Get a specific witness by their ID"""
-    try:
-        result = supabase.table('congressional_hearings').select('witnesses,hearing_name,committee,hearing_date').execute()
-        
-        if not result.data:
-            raise HTTPException(status_code=404, detail="Witness not found")
-        
-        row = result.data[0]
-        return WitnessResponse(
-            id=row['id'],
-            witness_id=row['witness_id'],
-            name=row['name'],
-            title=row['title'] or '',
-            witness_type=row['witness_type'],
-            organization_name=row['organization_name'],
-            tribal_affiliation=row['tribal_affiliation'],
-            topics=row['topics'] or [],
-            keywords=row['keywords'] or [],
-            expertise_areas=row['expertise_areas'] or [],
-            document_count=row['document_count'] or 0,
-            created_at=row['created_at']
-        )
-    
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error retrieving witness: {str(e)}")
-
-@app.get("/hearings", response_model=List[HearingResponse], summary="Get All Hearings")
+@app.get("/hearings", responses={200: {"model": List[HearingResponse]}}, summary="Get All Hearings")
 async def get_hearings(
     limit: int = Query(100, ge=1, le=1000),
     offset: int = Query(0, ge=0),
@@ -265,7 +338,7 @@ async def get_hearings(
 ):
     """Get hearings with optional filtering and pagination"""
     try:
-        query = supabase.table('hearing_details_view').select('*')
+        query = supabase.table('hearing_details_view').select(HEARING_COLUMNS)
         
         if committee:
             query = query.ilike('committee_name', f'%{committee}%')
@@ -278,7 +351,7 @@ async def get_hearings(
         
         query = query.order('hearing_date', desc=True).range(offset, offset + limit - 1)
         
-        result = query.execute()
+        result = await query.execute()
         
         hearings = []
         for row in result.data:
@@ -295,27 +368,25 @@ async def get_hearings(
                 created_at=row['created_at']
             ))
         
-        return hearings
+        return _json_list(HEARING_LIST_ADAPTER, hearings)
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving hearings: {str(e)}")
 
-@app.get("/hearings/{event_id}/witnesses", response_model=List[WitnessResponse], summary="Get Witnesses for Hearing")
+@app.get("/hearings/{event_id}/witnesses", responses={200: {"model": List[WitnessResponse]}}, summary="Get Witnesses for Hearing")
 async def get_hearing_witnesses(event_id: str):
     """Get all witnesses who testified at a specific hearing"""
     try:
         # First check if hearing exists
-        hearing_result = supabase.table('hearings').select('id').eq('event_id', event_id).execute()
+        hearing_result = await supabase.table('hearings').select('id').eq('event_id', event_id).execute()
         if not hearing_result.data:
             raise HTTPException(status_code=404, detail="Hearing not found")
         
         hearing_id = hearing_result.data[0]['id']
         
-        # Get witnesses for this hearing
-        result = supabase.table('congressional_hearings').select('witnesses,hearing_name,committee,hearing_date') \
-            .in_('id', 
-                 supabase.table('witness_hearings').select('witness_id').eq('hearing_id', hearing_id).execute().data
-            ).execute()
+        # Get witnesses for this hearing, joined through witness_hearings in the same request
+        result = await supabase.table('witness_details_view').select(f'{WITNESS_COLUMNS},witness_hearings!inner(hearing_id)') \
+            .eq('witness_hearings.hearing_id', hearing_id).execute()
         
         witnesses = []
         for row in result.data:
@@ -334,42 +405,47 @@ async def get_hearing_witnesses(event_id: str):
                 created_at=row['created_at']
             ))
         
-        return witnesses
+        return _json_list(WITNESS_LIST_ADAPTER, witnesses)
     
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving hearing witnesses: {str(e)}")
 
-@app.get("/committees", response_model=List[CommitteeResponse], summary="Get All Committees")
+@cached(REFERENCE_CACHE_TTL_SECONDS)
+async def _committees_json() -> bytes:
+    result = await supabase.table('committees').select('*').order('name').execute()
+    
+    committees = []
+    for row in result.data:
+        committees.append(CommitteeResponse(
+            id=row['id'],
+            committee_code=row['committee_code'],
+            name=row['name'],
+            parent_committee_id=row.get('parent_committee_id'),
+            created_at=row['created_at']
+        ))
+    
+    return COMMITTEE_LIST_ADAPTER.dump_json(committees)
+
+@app.get("/committees", responses={200: {"model": List[CommitteeResponse]}}, summary="Get All Committees")
 async def get_committees():
     """Get all committees"""
     try:
-        result = supabase.table('committees').select('*').order('name').execute()
-        
-        committees = []
-        for row in result.data:
-            committees.append(CommitteeResponse(
-                id=row['id'],
-                committee_code=row['committee_code'],
-                name=row['name'],
-                parent_committee_id=row.get('parent_committee_id'),
-                created_at=row['created_at']
-            ))
-        
-        return committees
+        # The serialized list is cached; each request gets its own Response
+        return _json_response(await _committees_json())
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving committees: {str(e)}")
 
-@app.get("/organizations", response_model=List[OrganizationResponse], summary="Get All Organizations")
+@app.get("/organizations", responses={200: {"model": List[OrganizationResponse]}}, summary="Get All Organizations")
 async def get_organizations(
     limit: int = Query(100, ge=1, le=1000),
     offset: int = Query(0, ge=0)
 ):
     """Get all organizations with pagination"""
     try:
-        result = supabase.table('organizations').select('*') \
+        result = await supabase.table('organizations').select('*') \
             .order('name').range(offset, offset + limit - 1).execute()
         
         organizations = []
@@ -383,46 +459,48 @@ async def get_organizations(
                 created_at=row['created_at']
             ))
         
-        return organizations
+        return _json_list(ORGANIZATION_LIST_ADAPTER, organizations)
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving organizations: {str(e)}")
 
-@app.get("/topics", response_model=List[TopicResponse], summary="Get All Topics")
+@cached(REFERENCE_CACHE_TTL_SECONDS)
+async def _topics_json() -> bytes:
+    result = await supabase.table('topics').select('*').order('display_name').execute()
+    
+    topics = []
+    for row in result.data:
+        topics.append(TopicResponse(
+            id=row['id'],
+            name=row['name'],
+            display_name=row['display_name'] or row['name'],
+            description=row.get('description')
+        ))
+    
+    return TOPIC_LIST_ADAPTER.dump_json(topics)
+
+@app.get("/topics", responses={200: {"model": List[TopicResponse]}}, summary="Get All Topics")
 async def get_topics():
     """Get all available topics"""
     try:
-        result = supabase.table('topics').select('*').order('display_name').execute()
-        
-        topics = []
-        for row in result.data:
-            topics.append(TopicResponse(
-                id=row['id'],
-                name=row['name'],
-                display_name=row['display_name'] or row['name'],
-                description=row.get('description')
-            ))
-        
-        return topics
+        return _json_response(await _topics_json())
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving topics: {str(e)}")
 
-@app.get("/witnesses/{witness_id}/documents", response_model=List[DocumentResponse], summary="Get Witness Documents")
+@app.get("/witnesses/{witness_id}/documents", responses={200: {"model": List[DocumentResponse]}}, summary="Get Witness Documents")
 async def get_witness_documents(witness_id: str):
     """Get all documents for a specific witness"""
     try:
-        # First get the internal witness ID
-        witness_result = supabase.table('witnesses').select('id').eq('witness_id', witness_id).execute()
-        if not witness_result.data:
+        # Resolve the witness and embed its documents in the same request
+        result = await supabase.table('witnesses') \
+            .select('id,documents(id,document_type,url,title,file_format,created_at)') \
+            .eq('witness_id', witness_id).execute()
+        if not result.data:
             raise HTTPException(status_code=404, detail="Witness not found")
         
-        internal_id = witness_result.data[0]['id']
-        
-        result = supabase.table('documents').select('*').eq('witness_id', internal_id).execute()
-        
         documents = []
-        for row in result.data:
+        for row in result.data[0].get('documents') or []:
             documents.append(DocumentResponse(
                 id=row['id'],
                 document_type=row['document_type'],
@@ -432,40 +510,26 @@ async def get_witness_documents(witness_id: str):
                 created_at=row['created_at']
             ))
         
-        return documents
+        return _json_list(DOCUMENT_LIST_ADAPTER, documents)
     
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving witness documents: {str(e)}")
 
-@app.get("/witnesses/{witness_id}/relationships", response_model=List[RelationshipResponse], summary="Get Witness Relationships")
+@app.get("/witnesses/{witness_id}/relationships", responses={200: {"model": List[RelationshipResponse]}}, summary="Get Witness Relationships")
 async def get_witness_relationships(witness_id: str):
     """Get all relationships for a specific witness"""
     try:
         # Get internal witness ID
-        witness_result = supabase.table('witnesses').select('id').eq('witness_id', witness_id).execute()
+        witness_result = await supabase.table('witnesses').select('id').eq('witness_id', witness_id).execute()
         if not witness_result.data:
             raise HTTPException(status_code=404, detail="Witness not found")
         
         internal_id = witness_result.data[0]['id']
         
         # Get relationships where this witness is source or target
-        relationships_query = f"""
-        SELECT 
-            wr.id,
-            w1.name as source_witness_name,
-            w2.name as target_witness_name,
-            wr.relationship_type,
-            wr.strength,
-            wr.context
-        FROM witness_relationships wr
-        JOIN witnesses w1 ON wr.source_witness_id = w1.id
-        JOIN witnesses w2 ON wr.target_witness_id = w2.id
-        WHERE wr.source_witness_id = '{internal_id}' OR wr.target_witness_id = '{internal_id}'
-        """
-        
-        result = supabase.rpc('execute_sql', {'query': relationships_query}).execute()
+        result = await supabase.rpc('get_witness_relationships', {'wid': internal_id}).execute()
         
         relationships = []
         for row in result.data:
@@ -478,7 +542,7 @@ async def get_witness_relationships(witness_id: str):
                 context=row.get('context')
             ))
         
-        return relationships
+        return _json_list(RELATIONSHIP_LIST_ADAPTER, relationships)
     
     except HTTPException:
         raise
@@ -498,29 +562,32 @@ async def search_all(
             "results": {}
         }
         
+        # Queries for each entity type are independent, so run them concurrently
+        searches = {}
+        
         if not entity_type or entity_type == "witnesses":
-            witnesses = supabase.table('congressional_hearings').select('witnesses,hearing_name,committee') \
+            searches["witnesses"] = supabase.table('congressional_hearings').select('witnesses,hearing_name,committee') \
                 .or_(f'name.ilike.%{q}%,title.ilike.%{q}%,organization_name.ilike.%{q}%') \
                 .limit(limit).execute()
-            results["results"]["witnesses"] = witnesses.data
         
         if not entity_type or entity_type == "hearings":
-            hearings = supabase.table('hearing_details_view').select('event_id,title,committee_name,hearing_date') \
+            searches["hearings"] = supabase.table('hearing_details_view').select('event_id,title,committee_name,hearing_date') \
                 .or_(f'title.ilike.%{q}%,committee_name.ilike.%{q}%') \
                 .limit(limit).execute()
-            results["results"]["hearings"] = hearings.data
         
         if not entity_type or entity_type == "committees":
-            committees = supabase.table('committees').select('committee_code,name') \
+            searches["committees"] = supabase.table('committees').select('committee_code,name') \
                 .or_(f'name.ilike.%{q}%,committee_code.ilike.%{q}%') \
                 .limit(limit).execute()
-            results["results"]["committees"] = committees.data
         
         if not entity_type or entity_type == "organizations":
-            organizations = supabase.table('organizations').select('name,organization_type,location') \
+            searches["organizations"] = supabase.table('organizations').select('name,organization_type,location') \
                 .ilike('name', f'%{q}%') \
                 .limit(limit).execute()
-            results["results"]["organizations"] = organizations.data
+        
+        responses = await asyncio.gather(*searches.values())
+        for name, response in zip(searches, responses):
+            results["results"][name] = response.data
         
         return results
     
@@ -528,18 +595,33 @@ async def search_all(
         raise HTTPException(status_code=500, detail=f"Error performing search: {str(e)}")
 
 # Congressional Hearings Endpoints
-@app.get("/congressional-hearings", response_model=List[CongressionalHearingResponse], summary="Get Congressional Hearings")
+@app.get("/congressional-hearings", responses={200: {"model": List[CongressionalHearingResponse]}}, summary="Get Congressional Hearings")
 async def get_congressional_hearings(
     limit: int = Query(100, ge=1, le=1000),
     offset: int = Query(0, ge=0),
     committee: Optional[str] = Query(None, description="Filter by committee name"),
     hearing_type: Optional[str] = Query(None, description="Filter by hearing type"),
     start_date: Optional[date] = Query(None, description="Filter hearings after this date"),
-    end_date: Optional[date] = Query(None, description="Filter hearings before this date")
+    end_date: Optional[date] = Query(None, description="Filter hearings before this date"),
+    after_date: Optional[date] = Query(None, description="Keyset cursor: hearing_date of the last row seen (from X-Next-After-Date)"),
+    after_id: Optional[int] = Query(None, description="Keyset cursor: id of the last row seen (from X-Next-After-Id)"),
+    fields: Optional[str] = Query(None, description="'thin' omits the members, witnesses and bill_numbers JSONB columns")
 ):
-    """Get congressional hearings with optional filtering and pagination"""
+    """Get congressional hearings with optional filtering and pagination
+    
+    Pass after_date/after_id from the previous page's X-Next-* headers to page by
+    keyset instead of offset; deep pages then cost the same as the first one.
+    Hearings without a hearing_date sort last and are only reachable by offset.
+    List views that don't need the JSONB columns can pass fields=thin.
+    """
+    if (after_date is None) != (after_id is None):
+        raise HTTPException(status_code=400, detail="after_date and after_id must be passed together")
+    
     try:
-        query = supabase.table('congressional_hearings').select('*')
+        columns = CONGRESSIONAL_HEARING_COLUMNS
+        if fields != 'thin':
+            columns = f'{columns},{CONGRESSIONAL_HEARING_JSONB_COLUMNS}'
+        query = supabase.table('congressional_hearings').select(columns)
         
         if committee:
             query = query.ilike('committee', f'%{committee}%')
@@ -553,20 +635,54 @@ async def get_congressional_hearings(
         if end_date:
             query = query.lte('hearing_date', end_date.isoformat())
         
-        query = query.order('hearing_date', desc=True).range(offset, offset + limit - 1)
-        
-        result = query.execute()
-        
-        return result.data or []
+        query = query.order('hearing_date', desc=True, nullsfirst=False).order('id', desc=True)
+        
+        if after_date is not None:
+            # (hearing_date, id) < (after_date, after_id)
+            cursor_date = after_date.isoformat()
+            query = query.or_(f'hearing_date.lt.{cursor_date},and(hearing_date.eq.{cursor_date},id.lt.{after_id})') \
+                .limit(limit)
+        else:
+            query = query.range(offset, offset + limit - 1)
+        
+        result = await query.execute()
+        rows = result.data or []
+        
+        # Rows come straight from the table, so skip response_model validation
+        response = ORJSONResponse(rows)
+        if len(rows) == limit and rows[-1]['hearing_date'] is not None:
+            response.headers["X-Next-After-Date"] = str(rows[-1]['hearing_date'])
+            response.headers["X-Next-After-Id"] = str(rows[-1]['id'])
+        return response
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving congressional hearings: {str(e)}")
 
+@app.get("/congressional-hearings/stats", summary="Get Congressional Hearings Statistics")
+@cached(STATS_CACHE_TTL_SECONDS)
+async def get_congressional_hearings_stats():
+    """Get statistics for congressional hearings"""
+    try:
+        # All four counts come from one SQL function (database/supabase_functions.sql)
+        result = await supabase.rpc('congressional_hearing_stats').execute()
+        stats = result.data[0] if result.data else {}
+        
+        return {
+            "total_hearings": stats.get('total_hearings') or 0,
+            "total_witnesses": stats.get('total_witnesses') or 0,
+            "total_committees": stats.get('total_committees') or 0,
+            "total_documents": stats.get('total_documents') or 0
+        }
+    
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error retrieving congressional hearings stats: {str(e)}")
+
+# Routes match in registration order, so this comes after /congressional-hearings/stats
 @app.get("/congressional-hearings/{hearing_id}", response_model=CongressionalHearingResponse, summary="Get Congressional Hearing by ID")
 async def get_congressional_hearing(hearing_id: int):
     """Get a specific congressional hearing by ID"""
     try:
-        result = supabase.table('congressional_hearings').select('*').eq('id', hearing_id).execute()
+        result = await supabase.table('congressional_hearings').select('*').eq('id', hearing_id).execute()
         
         if not result.data:
             raise HTTPException(status_code=404, detail="Congressional hearing not found")
@@ -578,50 +694,11 @@ async def get_congressional_hearing(hearing_id: int):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving congressional hearing: {str(e)}")
 
-@app.get("/congressional-hearings/stats", summary="Get Congressional Hearings Statistics")
-async def get_congressional_hearings_stats():
-    """Get statistics for congressional hearings"""
-    try:
-        # Total hearings count
-        hearings_count = supabase.table('congressional_hearings').select('id', count='exact').execute()
-        
-        # Count unique witnesses across all hearings
-        witnesses_data = supabase.table('congressional_hearings').select('witnesses').execute()
-        all_witnesses = set()
-        for hearing in witnesses_data.data or []:
-            for witness in hearing.get('witnesses', []):
-                if witness.get('name'):
-                    all_witnesses.add(witness['name'])
-        
-        # Count unique committees
-        committees_data = supabase.table('congressional_hearings').select('committee').execute()
-        unique_committees = set(h['committee'] for h in committees_data.data or [])
-        
-        # Count total documents
-        documents_data = supabase.table('congressional_hearings').select('document_url, witnesses').execute()
-        total_documents = 0
-        for hearing in documents_data.data or []:
-            if hearing.get('document_url'):
-                total_documents += 1
-            for witness in hearing.get('witnesses', []):
-                if witness.get('documents'):
-                    total_documents += len(witness['documents'])
-        
-        return {
-            "total_hearings": hearings_count.count or 0,
-            "total_witnesses": len(all_witnesses),
-            "total_committees": len(unique_committees),
-            "total_documents": total_documents
-        }
-    
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error retrieving congressional hearings stats: {str(e)}")
-
 @app.get("/congressional-hearings/{hearing_id}/witnesses", summary="Get Witnesses for Congressional Hearing")
 async def get_congressional_hearing_witnesses(hearing_id: int):
     """Get all witnesses for a specific congressional hearing"""
     try:
-        result = supabase.table('congressional_hearings').select('witnesses').eq('id', hearing_id).execute()
+        result = await supabase.table('congressional_hearings').select('witnesses').eq('id', hearing_id).execute()
         
         if not result.data:
             raise HTTPException(status_code=404, detail="Congressional hearing not found")
@@ -634,78 +711,93 @@ async def get_congressional_hearing_witnesses(hearing_id: int):
         raise HTTPException(status_code=500, detail=f"Error retrieving congressional hearing witnesses: {str(e)}")
 
 @app.get("/committees/congressional", summary="Get Committee Statistics from Congressional Hearings")
+@cached(STATS_CACHE_TTL_SECONDS)
 async def get_congressional_committee_stats():
     """Get committee statistics from congressional hearings data"""
     try:
-        result = supabase.table('congressional_hearings').select('committee, hearing_type').execute()
-        
-        committee_counts = {}
-        for hearing in result.data or []:
-            committee = hearing['committee']
-            committee_counts[committee] = committee_counts.get(committee, 0) + 1
-        
-        return [
-            {"name": committee, "count": count}
-            for committee, count in sorted(committee_counts.items(), key=lambda x: x[1], reverse=True)
-        ]
+        # Grouped and sorted in Postgres (database/supabase_functions.sql)
+        result = await supabase.rpc('committee_counts').execute()
+        return result.data or []
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving committee stats: {str(e)}")
 
+async def _iter_unique_witnesses(columns: str):
+    """Yield unique_witnesses_mv rows in first-appearance order, one page at a time"""
+    offset = 0
+    while True:
+        # PostgREST caps each response at its max-rows setting
+        page = await supabase.table('unique_witnesses_mv').select(columns) \
+            .order('first_seen_row').order('name') \
+            .range(offset, offset + UNIQUE_WITNESSES_PAGE_SIZE - 1).execute()
+        rows = page.data or []
+        yield rows
+        if len(rows) < UNIQUE_WITNESSES_PAGE_SIZE:
+            return
+        offset += UNIQUE_WITNESSES_PAGE_SIZE
+
+async def _select_unique_witnesses(columns: str) -> List[Dict[str, Any]]:
+    """Read all of unique_witnesses_mv into a list"""
+    witnesses = []
+    async for rows in _iter_unique_witnesses(columns):
+        witnesses.extend(rows)
+    return witnesses
+
+async def _stream_json_array(first_rows, pages):
+    """Encode an already-fetched first page plus the remaining pages as a single
+    JSON array, one page in memory at a time"""
+    yield b'[' + b','.join(orjson.dumps(row) for row in first_rows)
+    first = not first_rows
+    async for rows in pages:
+        if not rows:
+            continue
+        chunk = b','.join(orjson.dumps(row) for row in rows)
+        yield chunk if first else b',' + chunk
+        first = False
+    yield b']'
+
 @app.get("/witnesses/congressional", summary="Get All Witnesses from Congressional Hearings")
 async def get_congressional_witnesses():
     """Get all unique witnesses from congressional hearings"""
     try:
-        result = supabase.table('congressional_hearings').select('witnesses, hearing_name, committee, hearing_date').execute()
-        
-        all_witnesses = {}
-        for hearing in result.data or []:
-            for witness in hearing.get('witnesses', []):
-                if witness.get('name'):
-                    witness_name = witness['name']
-                    if witness_name not in all_witnesses:
-                        all_witnesses[witness_name] = {
-                            "name": witness_name,
-                            "title": witness.get('title', ''),
-                            "organization": witness.get('organization', ''),
-                            "hearings": [],
-                            "committees": set(),
-                            "topics": witness.get('topics', [])
-                        }
-                    
-                    all_witnesses[witness_name]["hearings"].append(hearing['hearing_name'])
-                    all_witnesses[witness_name]["committees"].add(hearing['committee'])
-        
-        # Convert sets to lists for JSON serialization
-        for witness in all_witnesses.values():
-            witness["committees"] = list(witness["committees"])
-        
-        return list(all_witnesses.values())
+        # Deduplicated by name in Postgres (unique_witnesses_mv in database/supabase_functions.sql)
+        # and streamed page by page rather than buffered. The first page is fetched
+        # before the response starts so a database error still returns a 500; after
+        # that a failed page can only cut the response short
+        pages = _iter_unique_witnesses('name,title,organization,hearings,committees,topics')
+        first_rows = await pages.__anext__()
+        return StreamingResponse(_stream_json_array(first_rows, pages), media_type="application/json")
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving congressional witnesses: {str(e)}")
 
 # Simple metrics endpoints for frontend compatibility
+@cached(STATS_CACHE_TTL_SECONDS)
+async def _count_hearings() -> int:
+    # A dashboard counter doesn't need an exact COUNT(*); the planner's row
+    # estimate is a catalog read, and head=True skips returning the rows
+    result = await supabase.table('congressional_hearings').select('id', count='planned', head=True).execute()
+    return result.count or 0
+
+@cached(STATS_CACHE_TTL_SECONDS)
+async def _count_unique_witnesses() -> int:
+    result = await supabase.rpc('unique_witness_count').execute()
+    return result.data or 0
+
 @app.get("/metrics/hearings-number", summary="Get Total Hearings Count")
 async def get_hearings_count():
     """Get total number of hearings (compatible with existing frontend)"""
     try:
-        result = supabase.table('congressional_hearings').select('id', count='exact').execute()
-        return result.count or 0
+        return await _count_hearings()
     except Exception as e:
+        # Not cached, so a brief outage doesn't pin the counter at 0 for the TTL
         return 0
 
 @app.get("/metrics/witnesses-number", summary="Get Total Witnesses Count")
 async def get_witnesses_count():
     """Get total number of unique witnesses (compatible with existing frontend)"""
     try:
-        result = supabase.table('congressional_hearings').select('witnesses').execute()
-        all_witnesses = set()
-        for hearing in result.data or []:
-            for witness in hearing.get('witnesses', []):
-                if witness.get('name'):
-                    all_witnesses.add(witness['name'])
-        return len(all_witnesses)
+        return await _count_unique_witnesses()
     except Exception as e:
         return 0
 
@@ -713,132 +805,98 @@ async def get_witnesses_count():
 async def get_all_witnesses_simple():
     """Get all witnesses in simple format (follows same pattern as working metrics endpoints)"""
     try:
-        result = supabase.table('congressional_hearings').select('witnesses, hearing_name, committee').execute()
-        witnesses_list = []
-        seen_witnesses = set()
-        
-        for hearing in result.data or []:
-            hearing_name = hearing.get('hearing_name', '')
-            committee = hearing.get('committee', '')
-            
-            for witness in hearing.get('witnesses', []):
-                witness_name = witness.get('name', '').strip()
-                if witness_name and witness_name not in seen_witnesses:
-                    seen_witnesses.add(witness_name)
-                    witnesses_list.append({
-                        'name': witness_name,
-                        'title': witness.get('title', ''),
-                        'organization': witness.get('organization', ''),
-                        'first_seen_hearing': hearing_name,
-                        'first_seen_committee': committee
-                    })
-        
-        return witnesses_list
+        return await _select_unique_witnesses('name,title,organization,first_seen_hearing,first_seen_committee')
     except Exception as e:
         return []
 
+# Registered after the fixed /witnesses/* paths above, which it would otherwise capture
+@app.get("/witnesses/{witness_id}", response_model=WitnessResponse, summary="Get Witness by ID")
+async def get_witness(witness_id: str):
+    """Get a specific witness by their ID"""
+    try:
+        result = await supabase.table('witness_details_view').select(WITNESS_COLUMNS).eq('witness_id', witness_id).execute()
+        
+        if not result.data:
+            raise HTTPException(status_code=404, detail="Witness not found")
+        
+        row = result.data[0]
+        return WitnessResponse(
+            id=row['id'],
+            witness_id=row['witness_id'],
+            name=row['name'],
+            title=row['title'] or '',
+            witness_type=row['witness_type'],
+            organization_name=row['organization_name'],
+            tribal_affiliation=row['tribal_affiliation'],
+            topics=row['topics'] or [],
+            keywords=row['keywords'] or [],
+            expertise_areas=row['expertise_areas'] or [],
+            document_count=row['document_count'] or 0,
+            created_at=row['created_at']
+        )
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error retrieving witness: {str(e)}")
+
+# Columns of the witness_aggregates_mv materialized view (database/supabase_functions.sql)
+WITNESS_AGGREGATE_COLUMNS = 'name,title,organization,topics,hearings,committees,hearing_count,most_recent_hearing'
+WITNESS_AGGREGATES_PAGE_SIZE = 1000
+
+# Committee-name keywords for topic inference, checked in order; first match wins
+COMMITTEE_TOPIC_KEYWORDS = (
+    ('Legal Affairs', ('judiciary', 'justice', 'legal')),
+    ('Energy & Commerce', ('energy', 'commerce', 'trade')),
+    ('Security', ('homeland', 'security', 'defense')),
+    ('Education', ('education', 'labor')),
+    ('Healthcare', ('health', 'medical')),
+    ('Technology', ('technology', 'science', 'innovation')),
+    ('Finance', ('finance', 'banking', 'economic')),
+    ('Environment', ('environment', 'climate')),
+)
+
+# keyword -> (priority, topic), plus one regex that finds every keyword in a single scan
+_KEYWORD_TO_TOPIC = {
+    keyword: (priority, topic)
+    for priority, (topic, keywords) in enumerate(COMMITTEE_TOPIC_KEYWORDS)
+    for keyword in keywords
+}
+_KEYWORD_RE = re.compile('|'.join(map(re.escape, _KEYWORD_TO_TOPIC)), re.IGNORECASE)
+
+@functools.lru_cache(maxsize=4096)
+def _infer_topic(committee: str) -> str:
+    """Broad topic for a committee name; the same few committees recur, so results are cached"""
+    matches = [_KEYWORD_TO_TOPIC[match.group(0).lower()] for match in _KEYWORD_RE.finditer(committee)]
+    # Several topics can match; keep the one listed first in COMMITTEE_TOPIC_KEYWORDS
+    return min(matches)[1] if matches else 'Policy'
+
+def _infer_topics(committees: List[str]) -> List[str]:
+    """Infer broad topics from committee names for witnesses with no explicit topics"""
+    return list({_infer_topic(committee) for committee in committees})
+
 @app.get("/api/witnesses/all", summary="Get All Real Witnesses from Database")
 async def get_all_witnesses():
     """Get all unique witnesses with their details from congressional hearings"""
     try:
-        # Fetch all congressional hearings with witnesses data
-        result = supabase.table('congressional_hearings').select('witnesses, hearing_name, committee, hearing_date').execute()
-        
-        # Dictionary to collect unique witnesses with aggregated data
-        witnesses_map = {}
-        
-        for hearing in result.data or []:
-            hearing_name = hearing.get('hearing_name', '')
-            committee = hearing.get('committee', '')
-            hearing_date = hearing.get('hearing_date', '')
-            
-            for witness in hearing.get('witnesses', []):
-                if not witness.get('name'):
-                    continue
-                    
-                witness_name = witness['name'].strip()
-                
-                if witness_name not in witnesses_map:
-                    witnesses_map[witness_name] = {
-                        'name': witness_name,
-                        'title': witness.get('title', '').strip(),
-                        'organization': witness.get('organization', '').strip(),
-                        'topics': [],
-                        'hearings': [],
-                        'committees': set(),
-                        'hearing_dates': []
-                    }
-                
-                # Aggregate data for this witness
-                witness_data = witnesses_map[witness_name]
-                
-                # Add hearing info
-                if hearing_name:
-                    witness_data['hearings'].append(hearing_name)
-                    
-                # Add committee
-                if committee:
-                    witness_data['committees'].add(committee)
-                    
-                # Add hearing date
-                if hearing_date:
-                    witness_data['hearing_dates'].append(hearing_date)
-                
-                # Extract topics from witness data if available
-                if witness.get('topics'):
-                    if isinstance(witness['topics'], list):
-                        witness_data['topics'].extend(witness['topics'])
-                    elif isinstance(witness['topics'], str):
-                        witness_data['topics'].append(witness['topics'])
-        
-        # Convert to final format and clean up data
+        # Grouped per witness in Postgres ahead of time (witness_aggregates_mv), most
+        # active first. Paged because PostgREST caps each response at its max-rows setting
         witnesses_list = []
-        for witness_name, data in witnesses_map.items():
-            # Convert sets to lists and deduplicate
-            committees_list = list(data['committees'])
-            topics_list = list(set(data['topics'])) if data['topics'] else []
+        offset = 0
+        while True:
+            page = await supabase.table('witness_aggregates_mv').select(WITNESS_AGGREGATE_COLUMNS) \
+                .order('hearing_count', desc=True).order('first_seen_row').order('name') \
+                .range(offset, offset + WITNESS_AGGREGATES_PAGE_SIZE - 1).execute()
+            rows = page.data or []
             
-            # Infer topics from committee names if no explicit topics
-            if not topics_list and committees_list:
-                inferred_topics = []
-                for committee in committees_list:
-                    committee_lower = committee.lower()
-                    if any(keyword in committee_lower for keyword in ['judiciary', 'justice', 'legal']):
-                        inferred_topics.append('Legal Affairs')
-                    elif any(keyword in committee_lower for keyword in ['energy', 'commerce', 'trade']):
-                        inferred_topics.append('Energy & Commerce')
-                    elif any(keyword in committee_lower for keyword in ['homeland', 'security', 'defense']):
-                        inferred_topics.append('Security')
-                    elif any(keyword in committee_lower for keyword in ['education', 'labor']):
-                        inferred_topics.append('Education')
-                    elif any(keyword in committee_lower for keyword in ['health', 'medical']):
-                        inferred_topics.append('Healthcare')
-                    elif any(keyword in committee_lower for keyword in ['technology', 'science', 'innovation']):
-                        inferred_topics.append('Technology')
-                    elif any(keyword in committee_lower for keyword in ['finance', 'banking', 'economic']):
-                        inferred_topics.append('Finance')
-                    elif any(keyword in committee_lower for keyword in ['environment', 'climate']):
-                        inferred_topics.append('Environment')
-                    else:
-                        inferred_topics.append('Policy')
-                        
-                topics_list = list(set(inferred_topics))
+            for witness in rows:
+                if not witness['topics'] and witness['committees']:
+                    witness['topics'] = _infer_topics(witness['committees'])
+            witnesses_list.extend(rows)
             
-            witness_record = {
-                'name': data['name'],
-                'title': data['title'],
-                'organization': data['organization'],
-                'topics': topics_list,
-                'hearings': data['hearings'],
-                'committees': committees_list,
-                'hearing_count': len(data['hearings']),
-                'most_recent_hearing': max(data['hearing_dates']) if data['hearing_dates'] else None
-            }
-            
-            witnesses_list.append(witness_record)
-        
-        # Sort by number of hearings (most active witnesses first)
-        witnesses_list.sort(key=lambda x: x['hearing_count'], reverse=True)
+            if len(rows) < WITNESS_AGGREGATES_PAGE_SIZE:
+                break
+            offset += WITNESS_AGGREGATES_PAGE_SIZE
         
         return {
             'total_witnesses': len(witnesses_list),
@@ -848,6 +906,18 @@ async def get_all_witnesses():
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving witnesses: {str(e)}")
 
+@app.post("/admin/invalidate", summary="Invalidate Response Cache")
+async def invalidate_response_cache(x_admin_token: Optional[str] = Header(None)):
+    """Drop cached stats/reference responses, e.g. after an ingestion run
+    
+    The cache is per process: with several uvicorn workers this only clears the
+    one that handles the request, and the others expire on their TTLs.
+    """
+    if ADMIN_TOKEN and x_admin_token != ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+    _response_cache.clear()
+    return {"invalidated": True}
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
@@ -0,0 +1,347 @@
+-- Views and functions used by the witness API (api/production/*.py)
+--
+-- Run this in the Supabase SQL Editor after the base schema. Every statement
+-- is CREATE OR REPLACE / IF NOT EXISTS, so the file can be re-run after edits.
+
+-- ============================================================
+-- Witness rows flattened out of congressional_hearings.witnesses (JSONB)
+-- ============================================================
+
+-- One row per (hearing, witness) with names already trimmed, so clients pull
+-- small flat rows instead of every hearing's full witnesses array
+CREATE OR REPLACE VIEW witness_rows AS
+SELECT
+    ch.id AS hearing_row_id,
+    x.ord AS witness_ord,
+    ch.hearing_name,
+    ch.committee,
+    ch.hearing_date,
+    btrim(x.w->>'name', E' \t\r\n') AS name,
+    coalesce(x.w->>'title', '') AS title,
+    btrim(coalesce(x.w->>'organization', ''), E' \t\r\n') AS organization,
+    coalesce(x.w->'topics', '[]'::jsonb) AS topics
+FROM congressional_hearings ch,
+     jsonb_array_elements(
+         CASE WHEN jsonb_typeof(ch.witnesses) = 'array' THEN ch.witnesses ELSE '[]'::jsonb END
+     ) WITH ORDINALITY AS x(w, ord)
+WHERE jsonb_typeof(x.w) = 'object'
+  AND btrim(coalesce(x.w->>'name', ''), E' \t\r\n') <> '';
+
+-- ============================================================
+-- Unique witnesses
+-- ============================================================
+
+-- One row per witness identity, using the same name|organization key as
+-- simple_witness_api._build_deduplicated_witnesses
+CREATE OR REPLACE VIEW unique_witnesses AS
+SELECT DISTINCT lower(name) || '|' || lower(organization) AS witness_key
+FROM witness_rows;
+
+CREATE OR REPLACE FUNCTION count_unique_witnesses()
+RETURNS bigint
+LANGUAGE sql STABLE
+AS $$
+    SELECT count(*) FROM unique_witnesses;
+$$;
+
+CREATE OR REPLACE FUNCTION count_unique_organizations()
+RETURNS bigint
+LANGUAGE sql STABLE
+AS $$
+    SELECT count(DISTINCT organization) FROM witness_rows WHERE organization <> '';
+$$;
+
+-- One page of deduplicated witnesses in the WitnessSimple shape. Witnesses are
+-- ordered by first appearance so pages stay stable between requests
+CREATE OR REPLACE FUNCTION get_witness_page(p_limit int, p_offset int)
+RETURNS TABLE (
+    name text,
+    title text,
+    organization text,
+    topics text[],
+    hearings text[],
+    committees text[]
+)
+LANGUAGE sql STABLE
+AS $$
+    SELECT
+        (array_agg(r.name ORDER BY r.hearing_row_id, r.witness_ord))[1],
+        coalesce((array_agg(r.title ORDER BY r.hearing_row_id, r.witness_ord) FILTER (WHERE r.title <> ''))[1], ''),
+        (array_agg(r.organization ORDER BY r.hearing_row_id, r.witness_ord))[1],
+        ARRAY[]::text[],
+        coalesce(array_agg(DISTINCT r.hearing_name) FILTER (WHERE coalesce(r.hearing_name, '') <> ''), ARRAY[]::text[]),
+        coalesce(array_agg(DISTINCT r.committee) FILTER (WHERE coalesce(r.committee, '') <> ''), ARRAY[]::text[])
+    FROM witness_rows r
+    GROUP BY lower(r.name) || '|' || lower(r.organization)
+    ORDER BY min(r.hearing_row_id), lower(r.name) || '|' || lower(r.organization)
+    LIMIT p_limit OFFSET p_offset;
+$$;
+
+-- ============================================================
+-- Witness aggregates for witness_api.py
+-- ============================================================
+
+-- witness_api counts witnesses by name alone (no organization in the key)
+CREATE OR REPLACE FUNCTION unique_witness_count()
+RETURNS bigint
+LANGUAGE sql STABLE
+AS $$
+    SELECT count(DISTINCT name) FROM witness_rows;
+$$;
+
+CREATE OR REPLACE FUNCTION witness_stats()
+RETURNS TABLE (
+    total_witness_appearances bigint,
+    unique_witnesses bigint
+)
+LANGUAGE sql STABLE
+AS $$
+    SELECT count(*), count(DISTINCT name) FROM witness_rows;
+$$;
+
+-- Backs containment filters on the witnesses array (witnesses @> '[{"name": ...}]')
+CREATE INDEX IF NOT EXISTS idx_congressional_hearings_witnesses
+    ON congressional_hearings USING gin (witnesses jsonb_path_ops);
+
+-- ============================================================
+-- Hearing date range
+-- ============================================================
+
+CREATE INDEX IF NOT EXISTS idx_congressional_hearings_hearing_date
+    ON congressional_hearings (hearing_date);
+
+-- min/max are answered from the hearing_date index instead of shipping every date
+CREATE OR REPLACE FUNCTION date_bounds()
+RETURNS TABLE (
+    date_range_start text,
+    date_range_end text
+)
+LANGUAGE sql STABLE
+AS $$
+    SELECT min(hearing_date)::text, max(hearing_date)::text FROM congressional_hearings;
+$$;
+
+-- Keyset pagination order for GET /congressional-hearings
+CREATE INDEX IF NOT EXISTS idx_congressional_hearings_date_id
+    ON congressional_hearings (hearing_date DESC, id DESC);
+
+-- Conflict target for the scraper's upsert(on_conflict='detail_url') in
+-- modal_launch/congressional_hearings_modal.py
+CREATE UNIQUE INDEX IF NOT EXISTS uq_congressional_hearings_detail_url
+    ON congressional_hearings (detail_url);
+
+-- ============================================================
+-- Witness relationships
+-- ============================================================
+
+-- Relationships where the witness is either side, with both names resolved
+CREATE OR REPLACE FUNCTION get_witness_relationships(wid uuid)
+RETURNS TABLE (
+    id uuid,
+    source_witness_name text,
+    target_witness_name text,
+    relationship_type text,
+    strength float8,
+    context text
+)
+LANGUAGE sql STABLE
+AS $$
+    SELECT
+        wr.id,
+        w1.name,
+        w2.name,
+        wr.relationship_type,
+        wr.strength,
+        wr.context
+    FROM witness_relationships wr
+    JOIN witnesses w1 ON wr.source_witness_id = w1.id
+    JOIN witnesses w2 ON wr.target_witness_id = w2.id
+    WHERE wr.source_witness_id = wid OR wr.target_witness_id = wid;
+$$;
+
+-- ============================================================
+-- Precomputed unique witnesses (by name) for witness_api.py
+-- ============================================================
+
+-- Backs /witnesses/congressional and /witnesses/all-simple. Refreshed after each
+-- ingestion run via refresh_unique_witnesses_mv(), by both congressional_hearings_modal.py
+-- and modal_witness_scraper.py; any other writer must call it too. IF NOT EXISTS keeps this file
+-- re-runnable, so DROP the view first when changing its definition
+CREATE MATERIALIZED VIEW IF NOT EXISTS unique_witnesses_mv AS
+SELECT
+    r.name,
+    (array_agg(r.title ORDER BY r.hearing_row_id, r.witness_ord))[1] AS title,
+    (array_agg(r.organization ORDER BY r.hearing_row_id, r.witness_ord))[1] AS organization,
+    (array_agg(r.topics ORDER BY r.hearing_row_id, r.witness_ord))[1] AS topics,
+    array_agg(r.hearing_name ORDER BY r.hearing_row_id, r.witness_ord) AS hearings,
+    array_agg(DISTINCT r.committee) AS committees,
+    (array_agg(r.hearing_name ORDER BY r.hearing_row_id, r.witness_ord))[1] AS first_seen_hearing,
+    (array_agg(r.committee ORDER BY r.hearing_row_id, r.witness_ord))[1] AS first_seen_committee,
+    min(r.hearing_row_id) AS first_seen_row
+FROM witness_rows r
+GROUP BY r.name;
+
+-- Required for REFRESH ... CONCURRENTLY
+CREATE UNIQUE INDEX IF NOT EXISTS idx_unique_witnesses_mv_name
+    ON unique_witnesses_mv (name);
+
+CREATE INDEX IF NOT EXISTS idx_unique_witnesses_mv_first_seen
+    ON unique_witnesses_mv (first_seen_row, name);
+
+-- CONCURRENTLY keeps the views readable by the API while they rebuild. Also
+-- refreshes witness_aggregates_mv (below), so writers only need the one call
+CREATE OR REPLACE FUNCTION refresh_unique_witnesses_mv()
+RETURNS void
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    REFRESH MATERIALIZED VIEW CONCURRENTLY unique_witnesses_mv;
+    REFRESH MATERIALIZED VIEW CONCURRENTLY witness_aggregates_mv;
+END;
+$$;
+
+-- ============================================================
+-- Congressional hearing stats
+-- ============================================================
+
+-- Everything GET /congressional-hearings/stats reports, in one round trip.
+-- Documents are hearing document_urls plus every witness's documents array
+CREATE OR REPLACE FUNCTION congressional_hearing_stats()
+RETURNS TABLE (
+    total_hearings bigint,
+    total_witnesses bigint,
+    total_committees bigint,
+    total_documents bigint
+)
+LANGUAGE sql STABLE
+AS $$
+    SELECT
+        (SELECT count(*) FROM congressional_hearings),
+        (SELECT count(DISTINCT name) FROM witness_rows),
+        (SELECT count(DISTINCT committee) FROM congressional_hearings),
+        (SELECT count(*) FROM congressional_hearings WHERE coalesce(document_url, '') <> '')
+        + (SELECT coalesce(sum(jsonb_array_length(x.w->'documents')), 0)
+           FROM congressional_hearings ch,
+                jsonb_array_elements(
+                    CASE WHEN jsonb_typeof(ch.witnesses) = 'array' THEN ch.witnesses ELSE '[]'::jsonb END
+                ) AS x(w)
+           WHERE jsonb_typeof(x.w->'documents') = 'array')::bigint;
+$$;
+
+-- Hearings per committee, busiest first, for GET /committees/congressional
+CREATE OR REPLACE FUNCTION committee_counts()
+RETURNS TABLE (
+    name text,
+    count bigint
+)
+LANGUAGE sql STABLE
+AS $$
+    SELECT committee, count(*) AS c
+    FROM congressional_hearings
+    GROUP BY committee
+    ORDER BY c DESC;
+$$;
+
+-- ============================================================
+-- Witness aggregates for GET /api/witnesses/all
+-- ============================================================
+
+-- One row per witness name with everything the endpoint reports except
+-- committee-inferred topics, which the API still adds in Python. Materialized
+-- because the endpoint reads it in pages, and as a plain view every page re-ran
+-- the whole unnest and GROUP BY. Refreshed by refresh_unique_witnesses_mv();
+-- DROP it first when changing its definition
+DROP VIEW IF EXISTS witness_aggregates;
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS witness_aggregates_mv AS
+WITH explicit_topics AS (
+    SELECT r.name, array_agg(DISTINCT t.topic) AS topics
+    FROM witness_rows r,
+         jsonb_array_elements_text(
+             CASE jsonb_typeof(r.topics)
+                 WHEN 'array' THEN r.topics
+                 WHEN 'string' THEN jsonb_build_array(r.topics)
+                 ELSE '[]'::jsonb
+             END
+         ) AS t(topic)
+    GROUP BY r.name
+)
+SELECT
+    r.name,
+    btrim((array_agg(r.title ORDER BY r.hearing_row_id, r.witness_ord))[1]) AS title,
+    (array_agg(r.organization ORDER BY r.hearing_row_id, r.witness_ord))[1] AS organization,
+    coalesce(et.topics, ARRAY[]::text[]) AS topics,
+    -- Hearings are de-duplicated so a witness listed twice in one hearing (or in
+    -- identically named hearings) isn't counted twice
+    coalesce(array_agg(DISTINCT r.hearing_name)
+             FILTER (WHERE coalesce(r.hearing_name, '') <> ''), ARRAY[]::text[]) AS hearings,
+    coalesce(array_agg(DISTINCT r.committee)
+             FILTER (WHERE coalesce(r.committee, '') <> ''), ARRAY[]::text[]) AS committees,
+    count(DISTINCT r.hearing_name) FILTER (WHERE coalesce(r.hearing_name, '') <> '') AS hearing_count,
+    max(r.hearing_date) AS most_recent_hearing,
+    min(r.hearing_row_id) AS first_seen_row
+FROM witness_rows r
+LEFT JOIN explicit_topics et ON et.name = r.name
+GROUP BY r.name, et.topics;
+
+-- Required for REFRESH ... CONCURRENTLY
+CREATE UNIQUE INDEX IF NOT EXISTS idx_witness_aggregates_mv_name
+    ON witness_aggregates_mv (name);
+
+-- Matches the endpoint's ORDER BY, so each page is an index range scan
+CREATE INDEX IF NOT EXISTS idx_witness_aggregates_mv_activity
+    ON witness_aggregates_mv (hearing_count DESC, first_seen_row, name);
+
+-- ============================================================
+-- Natural keys for database/supabase_loader.py
+-- ============================================================
+
+-- The loader upserts with on_conflict on these keys (ignoring duplicates), so
+-- re-running a load never double-inserts. Remove existing duplicates first if
+-- an index fails to build
+CREATE UNIQUE INDEX IF NOT EXISTS uq_committees_committee_code ON committees (committee_code);
+CREATE UNIQUE INDEX IF NOT EXISTS uq_organizations_name ON organizations (name);
+CREATE UNIQUE INDEX IF NOT EXISTS uq_hearings_event_id ON hearings (event_id);
+CREATE UNIQUE INDEX IF NOT EXISTS uq_witnesses_witness_id ON witnesses (witness_id);
+CREATE UNIQUE INDEX IF NOT EXISTS uq_topics_name ON topics (name);
+CREATE UNIQUE INDEX IF NOT EXISTS uq_witness_hearings_pair ON witness_hearings (witness_id, hearing_id);
+CREATE UNIQUE INDEX IF NOT EXISTS uq_witness_topics_pair ON witness_topics (witness_id, topic_id);
+CREATE UNIQUE INDEX IF NOT EXISTS uq_witness_relationships_pair ON witness_relationships (source_witness_id, target_witness_id);
+CREATE UNIQUE INDEX IF NOT EXISTS uq_documents_witness_url ON documents (witness_id, url);
+
+-- ============================================================
+-- Co-testimony relationships for database/supabase_loader.py
+-- ============================================================
+
+-- Pairs every two witnesses who share a hearing in one INSERT ... SELECT and
+-- returns how many new relationships were created. Pairs are stored with the
+-- smaller witness id as source; the NOT EXISTS skips pairs an older load stored
+-- the other way round
+CREATE OR REPLACE FUNCTION create_cotestify_relationships()
+RETURNS integer
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    inserted integer;
+BEGIN
+    INSERT INTO witness_relationships (source_witness_id, target_witness_id, relationship_type, strength, context)
+    SELECT DISTINCT ON (a.witness_id, b.witness_id)
+        a.witness_id,
+        b.witness_id,
+        'testified_together',
+        1.0,
+        'Both testified in hearing ' || h.event_id
+    FROM witness_hearings a
+    JOIN witness_hearings b ON b.hearing_id = a.hearing_id AND a.witness_id < b.witness_id
+    JOIN hearings h ON h.id = a.hearing_id
+    WHERE NOT EXISTS (
+        SELECT 1 FROM witness_relationships wr
+        WHERE wr.source_witness_id = b.witness_id AND wr.target_witness_id = a.witness_id
+    )
+    ORDER BY a.witness_id, b.witness_id, h.event_id
+    ON CONFLICT (source_witness_id, target_witness_id) DO NOTHING;
+    
+    GET DIAGNOSTICS inserted = ROW_COUNT;
+    RETURN inserted;
+END;
+$$;
@@ -10,6 +10,7 @@ import argparse
 import sys
 import os
 from datetime import datetime
+from functools import lru_cache
 
 def run_scraper(args):
     """Run the House witness scraper"""
@@ -19,7 +20,7 @@ def run_scraper(args):
     database = scraper.scrape_all_witnesses(max_events=args.max_events)
     
     # Export to JSON
-    output_filename = args.output or f"house_witnesses_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    output_filename = args.output or f"house_witnesses_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json.gz"
     scraper.export_to_json(output_filename, database)
     
     print(f"Scraping complete!")
@@ -98,35 +99,79 @@ def run_loader(args):
 def run_api(args):
     """Run the FastAPI server"""
     import uvicorn
-    from api.witness_api import app
     
     print(f"Starting Congressional Witness API server...")
     print(f"Server will be available at: http://localhost:{args.port}")
     print(f"API documentation: http://localhost:{args.port}/docs")
     
-    uvicorn.run(app, host=args.host, port=args.port, reload=args.reload)
+    # Passed as an import string so uvicorn can start several worker processes
+    # (or reload); uvloop has no Windows build
+    uvicorn.run(
+        "api.production.witness_api:app",
+        host=args.host,
+        port=args.port,
+        reload=args.reload,
+        workers=args.workers,
+        loop="asyncio" if sys.platform == 'win32' else "uvloop",
+        http="httptools"
+    )
 
-def main():
-    """Main entry point"""
+# Fixed-path endpoints that share a prefix with a parameterized route; each must
+# answer itself rather than be captured by /witnesses/{witness_id} and friends
+SMOKE_ENDPOINTS = (
+    '/witnesses/congressional',
+    '/witnesses/all-simple',
+    '/congressional-hearings/stats',
+    '/committees/congressional',
+    '/metrics/hearings-number',
+    '/metrics/witnesses-number',
+    '/api/witnesses/all',
+)
+
+def run_smoke(args):
+    """Check that each endpoint in SMOKE_ENDPOINTS returns 200 from a running API"""
+    import requests
+    
+    failures = 0
+    for path in SMOKE_ENDPOINTS:
+        try:
+            status = requests.get(f"{args.base_url.rstrip('/')}{path}", timeout=args.timeout).status_code
+        except requests.RequestException as e:
+            status = e
+        ok = status == 200
+        failures += not ok
+        print(f"{'✅' if ok else '❌'} GET {path}: {status}")
+    
+    if failures:
+        print(f"❌ {failures} endpoint(s) failed")
+        sys.exit(1)
+    print("✅ All endpoints returned 200")
+
+@lru_cache(maxsize=1)
+def build_parser() -> argparse.ArgumentParser:
+    """Build the CLI parser once; callers that import main reuse it"""
     parser = argparse.ArgumentParser(
         description="Congressional Witness Visualizer - Tools for scraping and analyzing House witness data",
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog="""
 Examples:
   # Run scraper to collect witness data
-  python main.py scrape --max-events 10 --output my_data.json
+  python main.py scrape --max-events 10 --output my_data.json.gz
   
   # Test the scraper
   python main.py test
   
   # Create visualizations from data
-  python main.py visualize my_data.json
+  python main.py visualize my_data.json.gz
   
   # Load data into Supabase
-  python main.py load my_data.json --supabase-url "https://xxx.supabase.co" --supabase-key "xxx"
+  python main.py load my_data.json.gz --supabase-url "https://xxx.supabase.co" --supabase-key "xxx"
   
   # Start API server
   python main.py api --port 8000
+  
+  # Smoke-check a running API server
+  python main.py smoke --base-url http://127.0.0.1:8000
         """
     )
     
@@ -137,7 +182,7 @@ Examples:
     scraper_parser.add_argument('--max-events', type=int, default=10, 
                                help='Maximum number of events to scrape (default: 10)')
     scraper_parser.add_argument('--output', '-o', 
-                               help='Output JSON filename (default: auto-generated)')
+                               help='Output JSON filename, gzipped if it ends in .gz (default: auto-generated .json.gz)')
     scraper_parser.set_defaults(func=run_scraper)
     
     # Test command
@@ -173,8 +218,24 @@ Examples:
     api_parser.add_argument('--port', type=int, default=8000, help='Port to bind to')
     api_parser.add_argument('--reload', action='store_true', 
                            help='Enable auto-reload for development')
+    api_parser.add_argument('--workers', type=int, default=1,
+                           help='Number of worker processes (default: 1; ignored with --reload). '
+                                'Each worker keeps its own response cache and Supabase connections, '
+                                'so /admin/invalidate only clears the worker that receives it')
     api_parser.set_defaults(func=run_api)
     
+    # API smoke check command
+    smoke_parser = subparsers.add_parser('smoke', help='Check that the API\'s fixed-path endpoints return 200')
+    smoke_parser.add_argument('--base-url', default='http://127.0.0.1:8000', help='Base URL of a running API server')
+    smoke_parser.add_argument('--timeout', type=float, default=120, help='Per-request timeout in seconds')
+    smoke_parser.set_defaults(func=run_smoke)
+    
+    return parser
+
+def main():
+    """Main entry point"""
+    parser = build_parser()
+    
     # Parse arguments
     args = parser.parse_args()
     
@@ -9,25 +9,26 @@ import modal
 import os
 import re
 import asyncio
-import requests
-from datetime import datetime, date
+import aiohttp
+import orjson
+from datetime import date
 from typing import List, Dict, Optional, Any, Tuple
 import json
-from dataclasses import dataclass, asdict
-import time
+from dataclasses import dataclass
 import random
-from bs4 import BeautifulSoup
+import logging
+from selectolax.lexbor import LexborHTMLParser
 
 # Modal app definition
 app = modal.App("congressional-hearings-scraper")
 
 # Modal image with dependencies
 image = modal.Image.debian_slim().pip_install([
-    "requests",
-    "beautifulsoup4", 
+    "aiohttp",
+    "orjson",
     "supabase==2.18.1",
     "python-dotenv",
-    "lxml"
+    "selectolax>=0.3.17"
 ])
 
 # Modal secrets for environment variables
@@ -36,6 +37,41 @@ secrets = [
     modal.Secret.from_name("congress-api-credentials"),  # Congress.gov API keys
 ]
 
+# Hearing workers per container, and the connection pool behind them
+HEARING_CONCURRENCY = 50
+MAX_CONNECTIONS = 200
+
+# Rate limits, transient server errors, dropped connections and timeouts are
+# retried with exponential backoff
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+MAX_RETRIES = 3
+RETRY_BACKOFF_SECONDS = 0.2
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=60, sock_connect=10)
+
+# Containers per function when main() fans out one input per congress / chunk
+MAX_CONTAINERS = 40
+
+# Hearings per parse_hearing_witnesses input
+PARSE_CHUNK_SIZE = 50
+
+# detail_url rows per request when loading already-scraped hearings
+KNOWN_URLS_PAGE_SIZE = 1000
+
+# Hearings per upsert request into congressional_hearings
+INSERT_CHUNK_SIZE = 500
+
+# Modal forwards container stdout over the network, so per-hearing detail is
+# only logged when DEBUG is set; summaries go out at INFO
+logging.basicConfig(level=logging.DEBUG if os.getenv("DEBUG") else logging.INFO,
+                    format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Witness section of a hearing transcript: a line reading just "Witnesses", up to
+# the first line mentioning statements, discussion or questions
+_WITNESS_HDR_RE = re.compile(r'^[^\S\n]*Witnesses[^\S\n]*$', re.IGNORECASE | re.MULTILINE)
+_END_MARK_RE = re.compile(r'opening statement|prepared statement|discussion|questions', re.IGNORECASE)
+_PAGE_NUM_RE = re.compile(r'^\d+$')
+
 @dataclass
 class CongressionalHearing:
     """Data structure for congressional hearings"""
@@ -51,6 +87,10 @@ class CongressionalHearing:
     members: List[str]
     witnesses: List[Dict[str, str]]
     bill_numbers: List[str]
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Row for congressional_hearings; a shallow copy, unlike asdict's recursive deep copy"""
+        return dict(self.__dict__)
 
 class APIKeyManager:
     """Manages rotation across all 82 Congress.gov API keys"""
@@ -88,23 +128,60 @@ class APIKeyManager:
         return key
     
     def get_random_key(self) -> str:
-        """Get random API key for parallel processing"""
-        return random.choice(self.api_keys)
+        """Get random API key for parallel processing
+        
+        Used by CongressAPIClient: with many requests in flight, independent random
+        picks spread load evenly across keys without a shared rotation index.
+        """
+        if not self.api_keys:
+            raise ValueError("No API keys available")
+        
+        key = random.choice(self.api_keys)
+        self.request_counts[key] += 1
+        return key
 
 class CongressAPIClient:
     """Enhanced Congress.gov API client with multi-key support"""
     
-    def __init__(self, key_manager: APIKeyManager):
+    def __init__(self, key_manager: APIKeyManager, session: aiohttp.ClientSession):
         self.key_manager = key_manager
         self.base_url = "https://api.congress.gov/v3"
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'CongressionalHearingsBot/1.0 (Educational Research)'
-        })
+        self.session = session
+    
+    @staticmethod
+    def create_session() -> aiohttp.ClientSession:
+        """Shared HTTP session; must be created inside the running event loop"""
+        # Keep idle connections (and their TLS sessions) around between hearings
+        # and cache DNS, so only the first request to each host pays for the handshake
+        return aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=MAX_CONNECTIONS, keepalive_timeout=30, ttl_dns_cache=300),
+            headers={'User-Agent': 'CongressionalHearingsBot/1.0 (Educational Research)'},
+            timeout=REQUEST_TIMEOUT
+        )
+    
+    async def _fetch(self, url: str, params: Optional[Dict[str, Any]] = None) -> bytes:
+        """GET a URL and return the body, retrying RETRY_STATUSES, connection errors
+        and timeouts with backoff"""
+        for attempt in range(MAX_RETRIES + 1):
+            rate_limited = False
+            try:
+                async with self.session.get(url, params=params) as response:
+                    if response.status not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                        response.raise_for_status()
+                        return await response.read()
+                    rate_limited = response.status == 429
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if attempt == MAX_RETRIES:
+                    raise
+            
+            # A 429 is charged to the key, so retry on a different one
+            if rate_limited and params and 'api_key' in params:
+                params = {**params, 'api_key': self.key_manager.get_random_key()}
+            await asyncio.sleep(RETRY_BACKOFF_SECONDS * 2 ** attempt)
     
-    def search_hearings(self, congress: str, chamber: str, limit: int = 250) -> List[Dict[str, Any]]:
+    async def search_hearings(self, congress: str, chamber: str, limit: int = 250) -> List[Dict[str, Any]]:
         """Search for hearings with API key rotation"""
-        api_key = self.key_manager.get_next_key()
+        api_key = self.key_manager.get_random_key()
         url = f"{self.base_url}/hearing"
         params = {
             'api_key': api_key,
@@ -115,240 +192,290 @@ class CongressAPIClient:
         }
         
         try:
-            response = self.session.get(url, params=params)
-            response.raise_for_status()
-            
-            data = response.json()
+            data = orjson.loads(await self._fetch(url, params))
             return data.get('hearings', [])
             
         except Exception as e:
             print(f"⚠️  Error searching hearings: {e}")
             return []
     
-    def get_hearing_details(self, congress: str, chamber: str, hearing_id: str) -> Optional[Dict[str, Any]]:
+    async def get_hearing_details(self, congress: str, chamber: str, hearing_id: str) -> Optional[Dict[str, Any]]:
         """Get detailed hearing information"""
-        api_key = self.key_manager.get_next_key()
+        api_key = self.key_manager.get_random_key()
         url = f"{self.base_url}/hearing/{congress}/{chamber}/{hearing_id}"
         params = {'api_key': api_key, 'format': 'json'}
         
         try:
-            response = self.session.get(url, params=params)
-            response.raise_for_status()
-            
-            data = response.json()
+            data = orjson.loads(await self._fetch(url, params))
             return data.get('hearing', {})
             
         except Exception as e:
             print(f"⚠️  Error getting hearing details for {hearing_id}: {e}")
             return None
     
-    def get_witnesses_from_html(self, html_url: str) -> List[Dict[str, str]]:
-        """Extract witnesses from hearing HTML document"""
+    async def get_hearing_html(self, html_url: str) -> Optional[bytes]:
+        """Download a hearing's HTML transcript; witnesses are parsed by parse_hearing_witnesses"""
         if not html_url:
-            return []
+            return None
         
         try:
-            api_key = self.key_manager.get_next_key()
-            
-            # Add API key to URL if needed
+            # Add API key if needed; passed as a param so _fetch can swap it on a 429
+            params = None
             if 'api_key=' not in html_url:
-                separator = '&' if '?' in html_url else '?'
-                html_url = f"{html_url}{separator}api_key={api_key}"
-            
-            response = self.session.get(html_url)
-            response.raise_for_status()
+                params = {'api_key': self.key_manager.get_random_key()}
             
-            soup = BeautifulSoup(response.content, 'html.parser')
-            text = soup.get_text()
-            
-            witnesses = []
-            
-            # Look for witnesses section
-            lines = text.split('\n')
-            in_witnesses_section = False
-            
-            for line in lines:
-                line = line.strip()
-                
-                # Start of witnesses section
-                if re.match(r'^\s*Witnesses\s*$', line, re.IGNORECASE):
-                    in_witnesses_section = True
-                    continue
-                
-                # End of witnesses section
-                if in_witnesses_section and any(marker in line.lower() for marker in [
-                    'opening statement', 'prepared statement', 'discussion', 'questions'
-                ]):
-                    break
-                
-                # Extract witness names
-                if in_witnesses_section and line:
-                    # Look for name patterns (usually comma-separated with titles)
-                    if ',' in line and len(line) < 200:
-                        parts = [part.strip() for part in line.split(',')]
-                        if len(parts) >= 2:
-                            # First part is usually the name
-                            name = parts[0].strip()
-                            # Skip if it looks like a page number or header
-                            if (name and 
-                                not re.match(r'^\d+$', name) and 
-                                len(name) > 2 and 
-                                not name.lower().startswith('page')):
-                                # Create structured witness object (matching house_gov_scraper format)
-                                witness_obj = {
-                                    "name": name,
-                                    "title": parts[1].strip() if len(parts) > 1 else "",
-                                    "organization": parts[2].strip() if len(parts) > 2 else ""
-                                }
-                                witnesses.append(witness_obj)
-            
-            return witnesses[:10]  # Limit to reasonable number
+            return await self._fetch(html_url, params)
             
         except Exception as e:
-            print(f"⚠️  Error extracting witnesses from HTML: {e}")
+            print(f"⚠️  Error fetching hearing HTML: {e}")
+            return None
+
+def extract_witnesses(content: bytes) -> List[Dict[str, str]]:
+    """Extract witnesses from hearing HTML document"""
+    try:
+        # No separator: transcripts keep their own line breaks, and splitting
+        # on every text node would break up "Name, Title, Organization" lines
+        body = LexborHTMLParser(content).body
+        text = body.text() if body is not None else ''
+        
+        witnesses = []
+        
+        # Look for witnesses section
+        header = _WITNESS_HDR_RE.search(text)
+        if not header:
             return []
+        
+        # The section stops before the line holding the first end marker
+        section_end = len(text)
+        if end := _END_MARK_RE.search(text, header.end()):
+            section_end = max(text.rfind('\n', header.end(), end.start()), header.end())
+        
+        for line in text[header.end():section_end].split('\n'):
+            line = line.strip()
+            
+            # Extract witness names
+            if line:
+                # Look for name patterns (usually comma-separated with titles)
+                if ',' in line and len(line) < 200:
+                    parts = [part.strip() for part in line.split(',')]
+                    if len(parts) >= 2:
+                        # First part is usually the name
+                        name = parts[0].strip()
+                        # Skip if it looks like a page number or header
+                        if (name and 
+                            not _PAGE_NUM_RE.match(name) and 
+                            len(name) > 2 and 
+                            not name.lower().startswith('page')):
+                            # Create structured witness object (matching house_gov_scraper format)
+                            witness_obj = {
+                                "name": name,
+                                "title": parts[1].strip() if len(parts) > 1 else "",
+                                "organization": parts[2].strip() if len(parts) > 2 else ""
+                            }
+                            witnesses.append(witness_obj)
+        
+        return witnesses[:10]  # Limit to reasonable number
+        
+    except Exception as e:
+        print(f"⚠️  Error extracting witnesses from HTML: {e}")
+        return []
 
 @app.function(
     image=image,
     secrets=secrets,
     timeout=3600,  # 1 hour timeout
-    cpu=2.0,
-    memory=4096
+    cpu=0.5,  # Network-bound: parsing happens in parse_hearing_witnesses
+    memory=4096,
+    max_containers=MAX_CONTAINERS
 )
-def scrape_congress_hearings_batch(congress_list: List[int], chamber: str, batch_size: int = 50) -> List[Dict[str, Any]]:
-    """Scrape hearings for multiple congress sessions"""
+def scrape_one_congress(congress: int, chamber: str, batch_size: int = 50) -> List[Dict[str, Any]]:
+    """Fetch hearings and their raw transcripts for one congress session; main() maps this over sessions"""
+    known_detail_urls = _known_detail_urls(congress, chamber)
+    print(f"🗂️  {len(known_detail_urls)} Congress {congress} {chamber} hearings already stored")
+    return asyncio.run(_scrape_congress_hearings(congress, chamber, batch_size, known_detail_urls))
+
+def _known_detail_urls(congress: int, chamber: str) -> set:
+    """detail_urls of hearings already in congressional_hearings for this congress and chamber"""
     from supabase import create_client
     
-    # Initialize components
-    key_manager = APIKeyManager()
-    api_client = CongressAPIClient(key_manager)
-    
-    # Initialize Supabase - use witness database
     supabase_url = os.environ.get('WITNESS_SUPABASE_URL') or os.environ.get('SUPABASE_URL')
     supabase_key = os.environ.get('WITNESS_SUPABASE_SERVICE_ROLE_KEY') or os.environ.get('SUPABASE_SERVICE_ROLE_KEY')
     
-    print(f"🔗 Connecting to Supabase: {supabase_url}")
     supabase = create_client(supabase_url, supabase_key)
     
-    all_hearings = []
+    # Paged because PostgREST caps each response at its max-rows setting
+    known = set()
+    offset = 0
+    while True:
+        page = supabase.table('congressional_hearings').select('detail_url') \
+            .eq('congress', congress).eq('hearing_type', chamber) \
+            .range(offset, offset + KNOWN_URLS_PAGE_SIZE - 1).execute()
+        rows = page.data or []
+        known.update(row['detail_url'] for row in rows)
+        
+        if len(rows) < KNOWN_URLS_PAGE_SIZE:
+            return known
+        offset += KNOWN_URLS_PAGE_SIZE
+
+async def _scrape_congress_hearings(congress: int, chamber: str, batch_size: int,
+                                    known_detail_urls: set) -> List[Dict[str, Any]]:
+    """Fetch every hearing of a congress with HEARING_CONCURRENCY queue workers"""
+    key_manager = APIKeyManager()
     
-    for congress in congress_list:
+    async with CongressAPIClient.create_session() as session:
+        api_client = CongressAPIClient(key_manager, session)
+        
         print(f"🏛️  Scraping {chamber} hearings for Congress {congress}...")
         
         # Search for hearings
-        hearing_summaries = api_client.search_hearings(str(congress), chamber, limit=batch_size)
+        hearing_summaries = await api_client.search_hearings(str(congress), chamber, limit=batch_size)
         print(f"📋 Found {len(hearing_summaries)} {chamber} hearings for Congress {congress}")
         
-        processed_count = 0
-        error_count = 0
+        counts = {'processed': 0, 'errors': 0, 'known': 0}
+        all_hearings = []
         
+        queue: asyncio.Queue = asyncio.Queue()
         for summary in hearing_summaries:
-            try:
-                hearing_id = summary.get('jacketNumber', '')
-                if not hearing_id:
-                    continue
-                
-                # Get detailed hearing info
-                hearing_details = api_client.get_hearing_details(str(congress), chamber, str(hearing_id))
-                
-                if not hearing_details:
-                    error_count += 1
-                    continue
-                
-                # Extract basic info
-                title = hearing_details.get('title', '')
-                dates = hearing_details.get('dates', [])
-                committees = hearing_details.get('committees', [])
-                formats = hearing_details.get('formats', [])
-                
-                # Parse date
-                hearing_date = None
-                if dates and len(dates) > 0:
-                    date_str = dates[0].get('date', '')
-                    if date_str:
-                        try:
-                            hearing_date = datetime.strptime(date_str, '%Y-%m-%d').date()
-                        except:
-                            continue
-                
-                if not hearing_date:
-                    continue
-                
-                # Extract committee
-                committee_name = ""
-                if committees and len(committees) > 0:
-                    committee_name = committees[0].get('name', '')
-                
-                # Determine subtype
-                hearing_subtype = None
-                if 'subcommittee' in title.lower():
-                    hearing_subtype = 'subcommittee'
-                
-                # Get document URLs
-                document_url = None
-                html_url = None
-                
-                for format_info in formats:
-                    format_type = format_info.get('type', '').lower()
-                    url = format_info.get('url', '')
-                    
-                    if 'pdf' in format_type:
-                        document_url = url
-                    elif 'html' in format_type or 'formatted text' in format_type:
-                        html_url = url
-                
-                # Extract witnesses from HTML
-                witnesses = []
-                if html_url:
-                    witnesses = api_client.get_witnesses_from_html(html_url)
-                
-                # Create hearing object
-                hearing = CongressionalHearing(
-                    congress=congress,
-                    hearing_type=chamber,
-                    hearing_subtype=hearing_subtype,
-                    committee=committee_name,
-                    hearing_date=hearing_date.isoformat(),
-                    hearing_name=title,
-                    serial_no=str(hearing_id),
-                    detail_url=f"https://api.congress.gov/v3/hearing/{congress}/{chamber}/{hearing_id}",
-                    document_url=document_url,
-                    members=[],  # Not available from API
-                    witnesses=witnesses,
-                    bill_numbers=[]  # Could extract from content
-                )
-                
-                hearing_dict = asdict(hearing)
-                all_hearings.append(hearing_dict)
-                processed_count += 1
-                
-                # Log successful hearing processing
-                print(f"✅ Processed: {title[:50]}... (Congress {congress}, {len(witnesses)} witnesses)")
-                
-                # Rate limiting per key
-                time.sleep(0.1)
-                
-            except Exception as e:
-                error_count += 1
-                print(f"⚠️  Error processing hearing {hearing_id}: {e}")
-                continue
-        
-        print(f"📊 Congress {congress} {chamber} summary: {processed_count} processed, {error_count} errors")
-        
-        # Only continue if we got at least some valid hearings
-        if processed_count == 0:
-            print(f"⚠️  No valid hearings found for Congress {congress} {chamber} - skipping database insertion")
-            return []
+            queue.put_nowait(summary)
+        
+        # Each worker takes the next summary as soon as it finishes one, so one
+        # hearing's HTML download overlaps other hearings' detail fetches with
+        # only HEARING_CONCURRENCY coroutines alive, however many summaries there are
+        async def worker():
+            while not queue.empty():
+                summary = queue.get_nowait()
+                if hearing := await _process_hearing(api_client, summary, congress, chamber, counts, known_detail_urls):
+                    all_hearings.append(hearing)
+        
+        await asyncio.gather(*(worker() for _ in range(HEARING_CONCURRENCY)))
+    
+    print(f"📊 Congress {congress} {chamber} summary: {counts['processed']} processed, {counts['known']} already stored, {counts['errors']} errors")
+    
+    # Only continue if we got at least some valid hearings
+    if counts['processed'] == 0:
+        print(f"⚠️  No valid hearings found for Congress {congress} {chamber} - skipping database insertion")
+        return []
     
     print(f"✅ Scraped {len(all_hearings)} hearings total")
     return all_hearings
 
+async def _process_hearing(api_client: CongressAPIClient, summary: Dict[str, Any], congress: int,
+                           chamber: str, counts: Dict[str, int], known_detail_urls: set) -> Optional[Dict[str, Any]]:
+    """Fetch one hearing's details and witnesses; None if it is skipped or fails"""
+    hearing_id = summary.get('jacketNumber', '')
+    try:
+        if not hearing_id:
+            return None
+        
+        # Hearings stored by an earlier run are skipped before any API or transcript fetch
+        detail_url = f"https://api.congress.gov/v3/hearing/{congress}/{chamber}/{hearing_id}"
+        if detail_url in known_detail_urls:
+            counts['known'] += 1
+            return None
+        
+        # Get detailed hearing info
+        hearing_details = await api_client.get_hearing_details(str(congress), chamber, str(hearing_id))
+        
+        if not hearing_details:
+            counts['errors'] += 1
+            return None
+        
+        # Extract basic info
+        title = hearing_details.get('title', '')
+        dates = hearing_details.get('dates', [])
+        committees = hearing_details.get('committees', [])
+        formats = hearing_details.get('formats', [])
+        
+        # Parse date
+        hearing_date = None
+        if dates and len(dates) > 0:
+            date_str = dates[0].get('date', '')
+            if date_str:
+                try:
+                    hearing_date = date.fromisoformat(date_str)
+                except (ValueError, TypeError):
+                    return None
+        
+        if not hearing_date:
+            return None
+        
+        # Extract committee
+        committee_name = ""
+        if committees and len(committees) > 0:
+            committee_name = committees[0].get('name', '')
+        
+        # Determine subtype
+        hearing_subtype = None
+        if 'subcommittee' in title.lower():
+            hearing_subtype = 'subcommittee'
+        
+        # Get document URLs
+        document_url = None
+        html_url = None
+        
+        for format_info in formats:
+            format_type = format_info.get('type', '').lower()
+            url = format_info.get('url', '')
+            
+            if 'pdf' in format_type:
+                document_url = url
+            elif 'html' in format_type or 'formatted text' in format_type:
+                html_url = url
+        
+        # Download the transcript; parse_hearing_witnesses extracts witnesses from it
+        transcript_html = await api_client.get_hearing_html(html_url) if html_url else None
+        
+        # Create hearing object
+        hearing = CongressionalHearing(
+            congress=congress,
+            hearing_type=chamber,
+            hearing_subtype=hearing_subtype,
+            committee=committee_name,
+            hearing_date=hearing_date.isoformat(),
+            hearing_name=title,
+            serial_no=str(hearing_id),
+            detail_url=detail_url,
+            document_url=document_url,
+            members=[],  # Not available from API
+            witnesses=[],  # Filled in by parse_hearing_witnesses
+            bill_numbers=[]  # Could extract from content
+        )
+        
+        counts['processed'] += 1
+        
+        # Log successful hearing processing
+        logger.debug("✅ Processed: %s... (Congress %s)", title[:50], congress)
+        
+        hearing_dict = hearing.to_dict()
+        hearing_dict['transcript_html'] = transcript_html
+        return hearing_dict
+        
+    except Exception as e:
+        counts['errors'] += 1
+        print(f"⚠️  Error processing hearing {hearing_id}: {e}")
+        return None
+
+@app.function(
+    image=image,
+    timeout=600,
+    cpu=2.0,
+    memory=2048,
+    max_containers=MAX_CONTAINERS
+)
+def parse_hearing_witnesses(hearings: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Fill in witnesses from the transcripts scrape_one_congress downloaded"""
+    for hearing in hearings:
+        transcript_html = hearing.pop('transcript_html', None)
+        hearing['witnesses'] = extract_witnesses(transcript_html) if transcript_html else []
+    return hearings
+
 @app.function(
     image=image,
     secrets=secrets,
     timeout=300,  # 5 minute timeout
     cpu=1.0,
-    memory=2048
+    memory=2048,
+    max_containers=MAX_CONTAINERS
 )
 def insert_hearings_to_supabase(hearings: List[Dict[str, Any]]) -> Dict[str, int]:
     """Insert hearings into Supabase database"""
@@ -366,67 +493,48 @@ def insert_hearings_to_supabase(hearings: List[Dict[str, Any]]) -> Dict[str, int
         'failed': 0
     }
     
-    print(f"🔍 Starting insertion of {len(hearings)} hearings...")
+    logger.info("🔍 Starting insertion of %d hearings...", len(hearings))
     
-    for i, hearing in enumerate(hearings):
+    for i in range(0, len(hearings), INSERT_CHUNK_SIZE):
+        chunk = hearings[i:i + INSERT_CHUNK_SIZE]
         try:
-            # Check if hearing already exists
-            detail_url = hearing['detail_url']
-            existing = supabase.table('congressional_hearings').select('id, hearing_name, created_at').eq('detail_url', detail_url).execute()
+            # One request per chunk; rows whose detail_url already exists come back
+            # out of result.data instead of costing a SELECT each
+            result = supabase.table('congressional_hearings') \
+                .upsert(chunk, on_conflict='detail_url', ignore_duplicates=True).execute()
             
-            if existing.data:
-                results['skipped'] += 1
-                existing_hearing = existing.data[0]
-                print(f"⏭️  DUPLICATE FOUND:")
-                print(f"     New: {hearing.get('hearing_name', 'Unknown')[:50]}...")
-                print(f"     Existing: {existing_hearing.get('hearing_name', 'Unknown')[:50]}...")
-                print(f"     URL: {detail_url}")
-                print(f"     Created: {existing_hearing.get('created_at', 'Unknown')}")
-                continue
+            inserted = len(result.data or [])
+            results['inserted'] += inserted
+            results['skipped'] += len(chunk) - inserted
+            logger.info("✅ Chunk %d: inserted=%d skipped=%d", i // INSERT_CHUNK_SIZE, inserted, len(chunk) - inserted)
+            logger.debug("   Detail URLs: %s", [hearing['detail_url'] for hearing in chunk])
             
-            # LOG THE EXACT DATA BEING INSERTED
-            print(f"📝 INSERTING HEARING DATA:")
-            print(f"   Name: {hearing.get('hearing_name', 'Unknown')}")
-            print(f"   Congress: {hearing.get('congress')}")
-            print(f"   Type: {hearing.get('hearing_type')}")
-            print(f"   Committee: {hearing.get('committee')}")
-            print(f"   Date: {hearing.get('hearing_date')}")
-            print(f"   Witnesses: {hearing.get('witnesses', [])}")
-            print(f"   Witness Count: {len(hearing.get('witnesses', []))}")
-            print(f"   Full Data Structure: {hearing}")
-            
-            # Insert hearing
-            result = supabase.table('congressional_hearings').insert(hearing).execute()
-            
-            if result.data:
-                results['inserted'] += 1
-                record_id = result.data[0].get('id')
-                print(f"✅ SUCCESS: Inserted hearing ID {record_id}")
-                print(f"   Name: {hearing.get('hearing_name', 'Unknown')[:50]}...")
-            else:
-                results['failed'] += 1
-                print(f"❌ FAILED: No data returned from insert")
-                print(f"   Hearing: {hearing.get('hearing_name', 'Unknown')}")
-                print(f"   Result object: {result}")
-                print(f"   Result data: {getattr(result, 'data', 'No data attr')}")
-                print(f"   Result error: {getattr(result, 'error', 'No error attr')}")
-                
         except Exception as e:
-            print(f"❌ DATABASE EXCEPTION for '{hearing.get('hearing_name', 'Unknown')[:30]}...':")
-            print(f"   Error: {e}")
-            print(f"   Error type: {type(e)}")
-            print(f"   Hearing data keys: {list(hearing.keys())}")
-            print(f"   Hearing data sample: {dict(list(hearing.items())[:3])}")
-            if hasattr(e, 'details'):
-                print(f"   Error details: {e.details}")
-            if hasattr(e, 'message'):
-                print(f"   Error message: {e.message}")
-            results['failed'] += 1
-    
-    print(f"📊 Batch results: {results['inserted']} inserted, {results['skipped']} skipped, {results['failed']} failed")
+            logger.error("❌ Chunk %d: failed=%d (%s: %s, details=%s)", i // INSERT_CHUNK_SIZE, len(chunk),
+                         type(e).__name__, e, getattr(e, 'details', None))
+            results['failed'] += len(chunk)
+    
+    logger.info("📊 Batch results: %d inserted, %d skipped, %d failed",
+                results['inserted'], results['skipped'], results['failed'])
     
     return results
 
+@app.function(
+    image=image,
+    secrets=secrets,
+    timeout=300
+)
+def refresh_witness_views():
+    """Rebuild the precomputed witness views the API reads from"""
+    from supabase import create_client
+    
+    supabase_url = os.environ.get('WITNESS_SUPABASE_URL') or os.environ.get('SUPABASE_URL')
+    supabase_key = os.environ.get('WITNESS_SUPABASE_SERVICE_ROLE_KEY') or os.environ.get('SUPABASE_SERVICE_ROLE_KEY')
+    
+    supabase = create_client(supabase_url, supabase_key)
+    supabase.rpc('refresh_unique_witnesses_mv').execute()
+    print("🔄 Refreshed unique_witnesses_mv")
+
 @app.local_entrypoint()
 def main():
     """Main entry point for Modal deployment"""
@@ -448,20 +556,18 @@ def main():
     for chamber in chambers:
         print(f"\n🏛️  Processing {chamber.upper()} hearings...")
         
-        # Scrape hearings in parallel batches
-        scraping_jobs = []
+        # One container per congress session, up to MAX_CONTAINERS at a time
+        fetched_hearings = []
+        for congress_hearings in scrape_one_congress.map(
+            congress_sessions, kwargs={'chamber': chamber, 'batch_size': batch_size}
+        ):
+            fetched_hearings.extend(congress_hearings)
         
-        # Split congress sessions into batches for parallel processing
-        for i in range(0, len(congress_sessions), 2):  # Process 2 congress sessions per batch
-            batch_congress = congress_sessions[i:i+2]
-            job = scrape_congress_hearings_batch.spawn(batch_congress, chamber, batch_size)
-            scraping_jobs.append(job)
-        
-        # Collect results from parallel jobs
+        # Witness extraction is CPU-bound, so it runs on separate, larger containers
         all_chamber_hearings = []
-        for job in scraping_jobs:
-            batch_hearings = job.get()
-            all_chamber_hearings.extend(batch_hearings)
+        parse_chunks = [fetched_hearings[i:i+PARSE_CHUNK_SIZE] for i in range(0, len(fetched_hearings), PARSE_CHUNK_SIZE)]
+        for parsed_hearings in parse_hearing_witnesses.map(parse_chunks):
+            all_chamber_hearings.extend(parsed_hearings)
         
         print(f"📊 Total {chamber} hearings scraped: {len(all_chamber_hearings)}")
         total_results['total_scraped'] += len(all_chamber_hearings)
@@ -469,21 +575,19 @@ def main():
         # Insert hearings to database in batches
         if all_chamber_hearings:
             # Split into chunks for parallel insertion
-            chunk_size = 50
-            insertion_jobs = []
-            
-            for i in range(0, len(all_chamber_hearings), chunk_size):
-                chunk = all_chamber_hearings[i:i+chunk_size]
-                job = insert_hearings_to_supabase.spawn(chunk)
-                insertion_jobs.append(job)
+            chunk_size = INSERT_CHUNK_SIZE
+            chunks = [all_chamber_hearings[i:i+chunk_size] for i in range(0, len(all_chamber_hearings), chunk_size)]
             
             # Collect insertion results
-            for job in insertion_jobs:
-                results = job.get()
+            for results in insert_hearings_to_supabase.map(chunks):
                 total_results['total_inserted'] += results['inserted']
                 total_results['total_skipped'] += results['skipped']
                 total_results['total_failed'] += results['failed']
     
+    # The API serves witness lists from a materialized view; rebuild it once new hearings land
+    if total_results['total_inserted']:
+        refresh_witness_views.remote()
+    
     # Final results
     print(f"\n🎯 FINAL RESULTS:")
     print(f"   Total hearings scraped: {total_results['total_scraped']}")
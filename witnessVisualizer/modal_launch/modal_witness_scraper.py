@@ -6,7 +6,6 @@ Runs witness scraping on Modal's infrastructure for scalable processing.
 import modal
 import os
 import sys
-import json
 import logging
 from datetime import datetime
 from pathlib import Path
@@ -26,7 +25,8 @@ image = modal.Image.debian_slim().pip_install([
     "pandas>=2.0.0",
     "numpy>=1.24.0",
     "python-dotenv>=1.0.0",
-    "supabase>=2.0.0"
+    "supabase>=2.0.0",
+    "orjson>=3.9.0"
 ]).add_local_dir(
     str(Path(__file__).parent.parent),
     remote_path="/app"
@@ -77,12 +77,10 @@ def scrape_house_witnesses(max_events: int = 10, save_to_supabase: bool = True):
         print(f"Starting scraping of {max_events} events...")
         database = scraper.scrape_all_witnesses(max_events=max_events)
         
-        # Save to volume as JSON
+        # Save to volume as gzipped JSON
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        output_filename = f"/data/house_witnesses_{timestamp}.json"
-        
-        with open(output_filename, 'w', encoding='utf-8') as f:
-            json.dump(database.to_json(), f, indent=2, ensure_ascii=False)
+        output_filename = f"/data/house_witnesses_{timestamp}.json.gz"
+        scraper.export_to_json(output_filename, database)
         
         result = {
             "success": True,
@@ -208,6 +206,15 @@ def save_to_supabase_db(database):
             print(f"❌ Error inserting hearing {hearing.event_id}: {e}")
     
     print(f"📊 Congressional hearings insert complete: {records_inserted} hearings with witness data")
+    
+    # The API reads witnesses from unique_witnesses_mv, which only changes on refresh
+    if records_inserted:
+        try:
+            supabase.rpc('refresh_unique_witnesses_mv').execute()
+            print("🔄 Refreshed unique_witnesses_mv")
+        except Exception as e:
+            print(f"❌ Error refreshing unique_witnesses_mv: {e}")
+    
     return records_inserted
 
 @app.function(
@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterator, Tuple
 from enum import Enum
 
 class WitnessType(Enum):
@@ -97,18 +97,25 @@ class WitnessDatabase:
     
     def to_json(self) -> Dict[str, Any]:
         """Export data for knowledge mapping visualization"""
+        data = {"metadata": self.metadata_to_dict()}
+        for key, records in self.iter_sections():
+            data[key] = list(records)
+        return data
+    
+    def metadata_to_dict(self) -> Dict[str, Any]:
         return {
-            "metadata": {
-                "scrape_date": self.scrape_date.isoformat(),
-                "total_witnesses": self.total_witnesses,
-                "date_range": [self.date_range[0].isoformat(), self.date_range[1].isoformat()]
-            },
-            "witnesses": [self._witness_to_dict(w) for w in self.witnesses],
-            "committees": [self._committee_to_dict(c) for c in self.committees],
-            "hearings": [self._hearing_to_dict(h) for h in self.hearings],
-            "organizations": [self._org_to_dict(o) for o in self.organizations]
+            "scrape_date": self.scrape_date.isoformat(),
+            "total_witnesses": self.total_witnesses,
+            "date_range": [self.date_range[0].isoformat(), self.date_range[1].isoformat()]
         }
     
+    def iter_sections(self) -> Iterator[Tuple[str, Iterator[Dict[str, Any]]]]:
+        """(key, records) for each array in the export, converting records lazily"""
+        yield "witnesses", (self._witness_to_dict(w) for w in self.witnesses)
+        yield "committees", (self._committee_to_dict(c) for c in self.committees)
+        yield "hearings", (self._hearing_to_dict(h) for h in self.hearings)
+        yield "organizations", (self._org_to_dict(o) for o in self.organizations)
+    
     def _witness_to_dict(self, witness: Witness) -> Dict[str, Any]:
         return {
             "id": witness.witness_id,
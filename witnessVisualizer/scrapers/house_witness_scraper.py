@@ -1,7 +1,8 @@
 import requests
 from bs4 import BeautifulSoup
 import re
-import json
+import gzip
+import orjson
 from datetime import datetime
 from typing import List, Dict, Optional, Tuple
 import time
@@ -465,13 +466,27 @@ class HouseWitnessScraper:
         )
     
     def export_to_json(self, filename: str, database: WitnessDatabase):
-        """Export scraped data to JSON file"""
+        """Export scraped data to JSON file, gzipped if the name ends in .gz
+        
+        Records are serialized and written one at a time, so the whole document
+        is never held in memory as a dict or a string.
+        """
         try:
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(database.to_json(), f, indent=2, ensure_ascii=False)
+            opener = gzip.open if filename.endswith('.gz') else open
+            with opener(filename, 'wb') as f:
+                f.write(b'{"metadata":' + orjson.dumps(database.metadata_to_dict()))
+                for key, records in database.iter_sections():
+                    f.write(b',"' + key.encode() + b'":[')
+                    for i, record in enumerate(records):
+                        if i:
+                            f.write(b',')
+                        f.write(orjson.dumps(record))
+                    f.write(b']')
+                f.write(b'}')
             self.logger.info(f"Data exported to {filename}")
         except Exception as e:
             self.logger.error(f"Error exporting data: {e}")
+            raise
 
 def main():
     """Main function to run the scraper"""
@@ -481,7 +496,7 @@ def main():
     database = scraper.scrape_all_witnesses(max_events=10)
     
     # Export to JSON
-    output_filename = f"house_witnesses_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    output_filename = f"house_witnesses_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json.gz"
     scraper.export_to_json(output_filename, database)
     
     print(f"Scraping complete!")
@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 
 import json
+import gzip
 import networkx as nx
 import matplotlib.pyplot as plt
 import plotly.graph_objects as go
@@ -16,7 +17,8 @@ class WitnessKnowledgeGraphVisualizer:
     """Creates interactive knowledge graphs from witness data"""
     
     def __init__(self, data_file: str):
-        with open(data_file, 'r') as f:
+        opener = gzip.open if data_file.endswith('.gz') else open
+        with opener(data_file, 'rt', encoding='utf-8') as f:
             self.data = json.load(f)
         
         self.witnesses = self.data.get('witnesses', [])